@@ -0,0 +1,166 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Capped feed of recent activity (logins, charges) in a site database.
+
+The feed is kept in the cache and updated as `user_logged_in`
+and `charge_updated` signals are triggered, such that the broker dashboard
+does not scan the users and charges tables every time it polls
+for recent activity.
+
+Updates are serialized through a short-lived lock in the `shared` cache
+such that concurrent processes do not overwrite each other's activity
+(provided the `shared` cache is shared between processes,
+see `CACHE_SHARED_BETWEEN_PROCESSES`).
+An activity is dropped (and logged) when the lock could not be acquired
+after `RECENT_ACTIVITY_LOCK_ATTEMPTS` attempts. It shows up again
+the next time the feed is rebuilt from the database.
+"""
+from __future__ import unicode_literals
+
+import logging, time
+from operator import itemgetter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from saas.helpers import datetime_or_now
+from saas.models import Charge
+
+from .cache import (cache_get_or_set, cache_set, get_db_alias,
+    get_db_cache_key)
+from .compat import gettext_lazy as _
+
+LOGGER = logging.getLogger(__name__)
+
+USER_LOGGED_IN = 'user_logged_in'
+CHARGE_PAID = 'charge_paid'
+CHARGE_FAILED = 'charge_failed'
+
+# The feed is cached per database (see `djaoapp.cache`), such that
+# charges updated outside of a request (ex: renewals) are recorded as well.
+RECENT_ACTIVITY_CACHE_KEY = 'recent_activity'
+RECENT_ACTIVITY_LOCK_KEY = 'recent_activity:lock'
+RECENT_ACTIVITY_LOCK_TIMEOUT = 5     # in seconds
+RECENT_ACTIVITY_LOCK_ATTEMPTS = 5
+RECENT_ACTIVITY_LOCK_WAIT = 0.01     # in seconds, between attempts
+
+ACTIVITY_DESCRS = {
+    USER_LOGGED_IN: _('recently logged in'),
+    CHARGE_PAID: _('charge paid'),
+    CHARGE_FAILED: _('charge failed'),
+}
+
+
+def _push_activity(feed, activity):
+    """
+    Inserts *activity* at the head of *feed*, replacing any previous
+    activity for the same slug, and truncates the feed
+    to `settings.RECENT_ACTIVITY_CUT_OFF` items.
+    """
+    feed = [activity] + [prev for prev in feed
+        if prev['slug'] != activity['slug']]
+    return feed[:settings.RECENT_ACTIVITY_CUT_OFF]
+
+
+def _user_activity(user):
+    full_name = user.get_full_name()
+    return {
+        'event': USER_LOGGED_IN,
+        'slug': user.username,
+        'printable_name': full_name if full_name else user.username,
+        'created_at': datetime_or_now(user.last_login),
+        'type': "user"}
+
+
+def _charge_activity(charge):
+    if charge.state == charge.DONE:
+        event = CHARGE_PAID
+    elif charge.state == charge.FAILED:
+        event = CHARGE_FAILED
+    else:
+        return None
+    return {
+        'event': event,
+        'slug': charge.customer.slug,
+        'printable_name': charge.customer.printable_name,
+        'created_at': charge.created_at}
+
+
+def _load_recent_activity(using):
+    """
+    Rebuilds the feed from the database *using* when it is not found
+    in the cache.
+    """
+    cut_off = settings.RECENT_ACTIVITY_CUT_OFF
+    activities = [_user_activity(user)
+        for user in get_user_model().objects.using(using).filter(
+            last_login__isnull=False).order_by('-last_login')[:cut_off]]
+    for charge in Charge.objects.using(using).filter(
+            state__in=(Charge.DONE, Charge.FAILED)).select_related(
+            'customer').order_by('-created_at')[:cut_off]:
+        activities += [_charge_activity(charge)]
+    feed = []
+    for activity in sorted(activities, key=itemgetter('created_at')):
+        feed = _push_activity(feed, activity)
+    return feed
+
+
+def record_activity(activity, using):
+    """
+    Adds *activity* to the recent activity feed for the database *using*.
+    """
+    if not activity:
+        return
+    using = get_db_alias(using)
+    shared = caches['shared']
+    lock_key = get_db_cache_key(RECENT_ACTIVITY_LOCK_KEY, using=using)
+    for _ in range(RECENT_ACTIVITY_LOCK_ATTEMPTS):
+        if shared.add(lock_key, True, timeout=RECENT_ACTIVITY_LOCK_TIMEOUT):
+            break
+        time.sleep(RECENT_ACTIVITY_LOCK_WAIT)
+    else:
+        LOGGER.warning("cannot record %s activity for %s (feed locked)",
+            activity['event'], activity['slug'],
+            extra={'event': 'recent-activity-dropped'})
+        return
+    try:
+        # The per-process cache might be stale, so we read the feed
+        # from the shared cache while holding the lock.
+        feed = shared.get(
+            get_db_cache_key(RECENT_ACTIVITY_CACHE_KEY, using=using))
+        if feed is None:
+            feed = _load_recent_activity(using)
+        cache_set(RECENT_ACTIVITY_CACHE_KEY, _push_activity(feed, activity),
+            using=using)
+    finally:
+        shared.delete(lock_key)
+
+
+def record_user_logged_in(user):
+    #pylint:disable=protected-access
+    record_activity(_user_activity(user), user._state.db)
+
+
+def record_charge_updated(charge):
+    #pylint:disable=protected-access
+    record_activity(_charge_activity(charge), charge._state.db)
+
+
+def get_recent_activities(start_at=None):
+    """
+    Returns the activities in the feed that happened after *start_at*,
+    sorted by printable name.
+    """
+    using = get_db_alias()
+    feed = cache_get_or_set(RECENT_ACTIVITY_CACHE_KEY,
+        lambda: _load_recent_activity(using), using=using)
+    results = []
+    for activity in feed:
+        if start_at and activity['created_at'] <= start_at:
+            continue
+        activity = activity.copy()
+        activity.update({'descr': ACTIVITY_DESCRS[activity.pop('event')]})
+        results += [activity]
+    return sorted(results, key=itemgetter('printable_name'))
@@ -1,4 +1,4 @@
-# Copyright (c) 2025, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 from __future__ import unicode_literals
 
@@ -15,14 +15,15 @@ from saas.models import Agreement
 from saas.mixins import OrganizationMixin
 from saas.utils import get_role_model
 from signup.api.auth import (JWTActivate as JWTActivateBase,
-    JWTRegister as JWTRegisterBase)
+    JWTLogin as JWTLoginBase, JWTRegister as JWTRegisterBase)
 from signup.api.tokens import JWTRefresh as JWTRefreshBase
 from signup.backends.sts_credentials import aws_bucket_context
 
-from ..mixins import AuthMixin
+from ..mixins import AuthMixin, ConditionalGetMixin
 from .serializers import RegisterSerializer, PublicSessionSerializer
 from ..edition_tools import get_user_menu_context
 from ..compat import is_authenticated, gettext_lazy as _
+from ..throttling import TokenBucketThrottle
 
 
 LOGGER = logging.getLogger(__name__)
@@ -73,7 +74,7 @@ class DynamicMenubarItemRenderer(TemplateHTMLRenderer):
         return data
 
 
-class DjaoAppJWTRefresh(JWTRefreshBase):
+class DjaoAppJWTRefresh(ConditionalGetMixin, JWTRefreshBase):
 
     template_name = '_menubar.html'
 
@@ -89,6 +90,15 @@ class DjaoAppJWTRefresh(JWTRefreshBase):
         return super(DjaoAppJWTRefresh, self).perform_content_negotiation(
             request, force=force)
 
+    def get_etag_version_keys(self):
+        if not is_authenticated(self.request):
+            return []
+        # The menubar lists the titles of role descriptions. `last_visited`
+        # is not computed yet (see `get`).
+        username = self.request.user.username
+        return ['user:%s' % username, 'roles:%s' % username, 'profiles',
+            'role_descriptions']
+
     def get(self, request, *args, **kwargs):
         """
         Retrieves authenticated user
@@ -141,6 +151,10 @@ class DjaoAppJWTRefresh(JWTRefreshBase):
         if not is_authenticated(request):
             return Response({}, status=status.HTTP_404_NOT_FOUND)
 
+        response = self.get_not_modified_response(request)
+        if response is not None:
+            return response
+
         request.user.roles = get_role_model().objects.valid_for(
             user=request.user).exclude(
             organization__slug=request.user.username).order_by(
@@ -192,6 +206,8 @@ JwcBUUMECj8AKxsHtRHUSypco"
         }
     """
     serializer_class = RegisterSerializer
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = 'register'
 
     def get_serializer_class(self):
         serializer_class = super(
@@ -291,3 +307,50 @@ class CredentialsAPIView(OrganizationMixin, generics.RetrieveAPIView):
         serializer = self.get_serializer(data=context)
         serializer.is_valid(raise_exception=True)
         return Response(serializer.validated_data)
+
+
+class DjaoAppJWTLogin(JWTLoginBase):
+    """
+    Authenticates a user
+
+    Returns a JSON Web Token that can be used in HTTP requests that require
+    authentication.
+
+    Authentication can be done either through a ``password``, or by verifying
+    access to an e-mail inbox (``email_code``) or access to a phone
+    (``phone_code``). See `sending a verification code <#auth_recover_create>`_
+
+    When Multi-Factor Authentication (MFA) is enabled, an additional
+    ``otp_code`` must be specified to authenticate a user.
+    See `enabling MFA <#users_otp_update>`_
+
+    The API is typically used within an HTML
+    `login page </docs/guides/themes/#workflow_login>`_
+    as present in the default theme.
+
+    **Tags: auth, visitor, usermodel
+
+    **Example
+
+    .. code-block:: http
+
+        POST /api/auth HTTP/1.1
+
+    .. code-block:: json
+
+        {
+          "username": "donny",
+          "password": "yoyo"
+        }
+
+    responds
+
+    .. code-block:: json
+
+        {"token":"eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9.eyJ1c2VybmFtZSI6\
+ImRvbm55IiwiZW1haWwiOiJzbWlyb2xvKzRAZGphb2RqaW4uY29tIiwiZnV\
+sbF9uYW1lIjoiRG9ubnkgQ29vcGVyIiwiZXhwIjoxNTI5NjU4NzEwfQ.F2y\
+1iwj5NHlImmPfSff6IHLN7sUXpBFmX0qjCbFTe6A"}
+    """
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = 'login'
@@ -1,10 +1,9 @@
-# Copyright (c) 2024, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 from __future__ import unicode_literals
 
 import logging, socket
 from smtplib import SMTPException
-import googlemaps
 
 from deployutils.apps.django_deployutils.compat import is_authenticated
 from django.contrib.auth import get_user_model
@@ -23,7 +22,9 @@ from saas.models import Organization
 from saas.pagination import TypeaheadPagination
 
 from ..compat import gettext_lazy as _, six
+from ..places import PLACES_ERRORS, place_detail, places_autocomplete
 from ..signals import user_contact
+from ..throttling import TokenBucketThrottle
 from .serializers import (ContactUsSerializer, PlacesSuggestionSerializer,
     PlacesDetailSerializer)
 
@@ -67,6 +68,8 @@ class ContactUsAPIView(ProviderMixin, GenericAPIView):
         }
     """
     serializer_class = ContactUsSerializer
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = 'contact'
 
     @extend_schema(responses={
         200: OpenApiResponse(ValidationDetailSerializer)})
@@ -172,10 +175,16 @@ class PlacesSuggestionsAPIView(ListAPIView):
     def get_queryset(self):
         results = []
         if settings.GOOGLE_API_KEY:
-            gmaps = googlemaps.Client(key=settings.GOOGLE_API_KEY)
             query = self.request.query_params.get(api_settings.SEARCH_PARAM)
             if query and len(query) > 2:
-                results = gmaps.places_autocomplete(query, types='address')
+                try:
+                    results = places_autocomplete(
+                        str(settings.GOOGLE_API_KEY), query)
+                except PLACES_ERRORS as err:
+                    # Auto-complete is a convenience. We return no candidates
+                    # rather than an error.
+                    LOGGER.warning("places autocomplete failed: %r", err,
+                        extra={'event': 'places-error'})
         return results
 
 
@@ -217,15 +226,17 @@ class PlacesDetailAPIView(RetrieveAPIView):
         200: OpenApiResponse(PlacesDetailSerializer)})
     def get(self, request, *args, **kwargs):
         if settings.GOOGLE_API_KEY:
-            gmaps = googlemaps.Client(key=settings.GOOGLE_API_KEY)
             place_id = kwargs.get('place_id')
             if place_id:
                 try:
-                    result = gmaps.place(place_id)
-                    if result['status'] == 'OK':
-                        serializer = self.get_serializer(result['result'])
-                        return Response(serializer.data)
-                except:
-                    pass
+                    result = place_detail(
+                        str(settings.GOOGLE_API_KEY), place_id)
+                except PLACES_ERRORS as err:
+                    LOGGER.warning("places detail for '%s' failed: %r",
+                        place_id, err, extra={'event': 'places-error'})
+                    return Response(status=status.HTTP_503_SERVICE_UNAVAILABLE)
+                if result:
+                    serializer = self.get_serializer(result)
+                    return Response(serializer.data)
 
         return Response(status=status.HTTP_404_NOT_FOUND)
@@ -1,40 +1,89 @@
-# Copyright (c) 2023, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 from __future__ import unicode_literals
 
-import logging
-
-from saas.api.organizations import (
+import csv, json, logging
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from saas import settings as saas_settings
+from saas.api.organizations import (OrganizationQuerysetMixin,
     OrganizationDetailAPIView as OrganizationDetailBaseAPIView,
     OrganizationListAPIView as OrganizationListBaseAPIView,
     OrganizationPictureAPIView as OrganizationPictureBaseAPIView)
-from saas.utils import get_organization_model
+from saas.docs import extend_schema, OpenApiResponse
+from saas.models import Subscription
+from saas.utils import datetime_or_now, get_organization_model, get_role_model
 from signup.models import Contact
 
+from ..compat import gettext_lazy as _
+from ..mixins import ConditionalGetMixin, SparseFieldsMixin
+from ..renderers import JSONRenderer
+from ..thread_locals import get_current_broker
 from .serializers import (ProfileDetailSerializer, ProfileSerializer)
 
 
 LOGGER = logging.getLogger(__name__)
 
-class ProfileDecorateMixin(object):
+
+class Echo(object):
+    """
+    Pseudo-buffer such that `csv.writer.writerow` returns the formatted row
+    instead of writing it.
+    """
+    @staticmethod
+    def write(value):
+        return value
+
+
+class ProfileDecorateMixin(SparseFieldsMixin):
+
+    # Serialized fields that depend on the profile being personal,
+    # and fields that are read from the contact of a personal profile.
+    personal_fields = ('type', 'credentials')
+    contact_fields = ('printable_name', 'nick_name', 'lang')
 
     def decorate_personal(self, page):
+        if not any([self.is_field_requested(field_name)
+                for field_name in self.personal_fields + self.contact_fields]):
+            return page
         super(ProfileDecorateMixin, self).decorate_personal(page)
+        if not any([self.is_field_requested(field_name)
+                for field_name in self.contact_fields]):
+            return page
         organization_model = get_organization_model()
         records = [page] if isinstance(page, organization_model) else page
-        for organization in records:
-            if (hasattr(organization, 'is_personal') and
-                organization.is_personal):
-                contact = organization.attached_user().contacts.first()
-                #pylint:disable=protected-access
-                for field in Contact._meta.fields:
-                    if not hasattr(organization, field.name):
-                        setattr(organization, field.name,
-                            getattr(contact, field.name) if contact else "")
+        personals = [organization for organization in records
+            if getattr(organization, 'is_personal', False)]
+        if not personals:
+            return page
+        # We load the contacts of all personal profiles in a single query.
+        # `is_personal` is set when the user with username == slug
+        # has a role on the profile (i.e. `attached_user()`), and we pick
+        # the same contact as `user.contacts.first()` would.
+        #pylint:disable=protected-access
+        contacts = {}
+        for contact in Contact.objects.db_manager(
+                using=personals[0]._state.db).filter(
+                user__username__in=[organization.slug
+                    for organization in personals]).select_related(
+                'user').order_by('-pk'):
+            contacts[contact.user.username] = contact
+        for organization in personals:
+            contact = contacts.get(organization.slug)
+            for field in Contact._meta.fields:
+                if not hasattr(organization, field.name):
+                    setattr(organization, field.name,
+                        getattr(contact, field.name) if contact else "")
         return page
 
 
-class DjaoAppProfileDetailAPIView(ProfileDecorateMixin,
+class DjaoAppProfileDetailAPIView(ConditionalGetMixin, ProfileDecorateMixin,
                                 OrganizationDetailBaseAPIView):
     """
     Retrieves a billing profile
@@ -43,6 +92,9 @@ class DjaoAppProfileDetailAPIView(ProfileDecorateMixin,
     `contact information page </docs/guides/themes/#dashboard_profile>`_
     as present in the default theme.
 
+    Only the fields listed in ``fields`` (comma-separated) are returned
+    when it is present (ex: ``?fields=slug,printable_name,picture``).
+
     **Tags**: profile, subscriber, profilemodel
 
     **Examples
@@ -88,6 +140,19 @@ class DjaoAppProfileDetailAPIView(ProfileDecorateMixin,
 #    queryset = get_organization_model().objects.all()
     serializer_class = ProfileDetailSerializer
 
+    def get_queryset(self):
+        queryset = super(DjaoAppProfileDetailAPIView, self).get_queryset()
+        if not self.is_field_requested('subscriptions'):
+            # Drops the `prefetch_related('subscriptions')`.
+            queryset = queryset.prefetch_related(None)
+        return queryset
+
+    def get_etag_version_keys(self):
+        profile = self.kwargs.get(self.organization_url_kwarg)
+        # A personal profile also shows the contact information
+        # of the user.
+        return ['profile:%s' % profile, 'user:%s' % profile, 'plans']
+
     def delete_records(self, user):
         user.contacts.all().update(user=None)
         user.notifications.all().delete()
@@ -156,7 +221,8 @@ class DjaoAppProfileListAPIView(ProfileDecorateMixin,
 
     The queryset can be further refined to match a search filter (``q``)
     and/or a range of dates ([``start_at``, ``ends_at``]),
-    and sorted on specific fields (``o``).
+    and sorted on specific fields (``o``). Only the fields listed
+    in ``fields`` (comma-separated) are returned when it is present.
 
     **Tags: profile
 
@@ -193,8 +259,184 @@ class DjaoAppProfileListAPIView(ProfileDecorateMixin,
                 "picture": ""
             }]
         }
+
+    All profiles matching the filters can also be downloaded in a single
+    response, one profile per line, by passing ``export=ndjson``
+    (newline-delimited JSON) or ``export=csv`` in the query string
+    (ex: ``?q=xia&export=csv``).
+    """
+    serializer_class = ProfileSerializer
+    export_param = 'export'
+    export_chunk_size = 1000
+
+    def list(self, request, *args, **kwargs):
+        export_format = request.query_params.get(self.export_param)
+        if export_format:
+            return self.get_export_response(export_format)
+        return super(DjaoAppProfileListAPIView, self).list(
+            request, *args, **kwargs)
+
+    def get_export_records(self, queryset):
+        """
+        Yields the serialized profiles in *queryset*, decorating
+        and serializing them `export_chunk_size` profiles at a time.
+        """
+        chunk = []
+        # `iterator` uses a server-side cursor where the database supports it,
+        # so profiles are not all loaded in memory at once.
+        for organization in queryset.iterator(
+                chunk_size=self.export_chunk_size):
+            chunk += [organization]
+            if len(chunk) >= self.export_chunk_size:
+                yield from self.get_serializer(
+                    self.decorate_personal(chunk), many=True).data
+                chunk = []
+        if chunk:
+            yield from self.get_serializer(
+                self.decorate_personal(chunk), many=True).data
+
+    def get_export_response(self, export_format):
+        if export_format not in ('csv', 'ndjson'):
+            raise ValidationError({self.export_param: _(
+                "'%(format)s' is not one of 'csv' or 'ndjson'.") % {
+                'format': export_format}})
+        queryset = self.filter_queryset(self.get_queryset())
+        records = self.get_export_records(queryset)
+        if export_format == 'csv':
+            content = self.as_csv(records)
+            content_type = 'text/csv'
+        else:
+            content = self.as_ndjson(records)
+            content_type = 'application/x-ndjson'
+        resp = StreamingHttpResponse(content, content_type=content_type)
+        resp['Content-Disposition'] = 'attachment; filename="%s"' % (
+            datetime_or_now().strftime('profiles-%Y%m%d.' + export_format))
+        return resp
+
+    @staticmethod
+    def as_ndjson(records):
+        renderer = JSONRenderer()
+        for record in records:
+            yield renderer.render(record) + b'\n'
+
+    def as_csv(self, records):
+        headings = [field_name for field_name, field
+            in self.get_serializer().fields.items() if not field.write_only]
+        csv_writer = csv.writer(Echo())
+        yield csv_writer.writerow(headings)
+        for record in records:
+            yield csv_writer.writerow([
+                self.as_csv_value(record.get(field)) for field in headings])
+
+    @staticmethod
+    def as_csv_value(value):
+        # Nested values (ex: `credentials`) are written as JSON.
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list, tuple)):
+            return json.dumps(value, cls=JSONEncoder)
+        return value
+
+
+class DjaoAppProfileBatchAPIView(ProfileDecorateMixin,
+                                 OrganizationQuerysetMixin, GenericAPIView):
+    """
+    Retrieves billing profiles in bulk
+
+    Returns the profiles whose slug is listed in ``slugs``
+    (comma-separated), keyed by slug, in a single request.
+    At most ``PROFILE_BATCH_MAX_SLUGS`` slugs can be requested at once.
+
+    The value is ``null`` for slugs that do not exist or are not
+    accessible to the request user, i.e. the request user does not have
+    a role on the profile, on a provider of the profile, or on the broker.
+
+    Only the fields listed in ``fields`` (comma-separated) are returned
+    when it is present.
+
+    **Tags: profile
+
+    **Examples
+
+    .. code-block:: http
+
+        GET /api/profiles?slugs=xia,unknown&fields=slug,printable_name HTTP/1.1
+
+    responds
+
+    .. code-block:: json
+
+        {
+            "xia": {
+                "slug": "xia",
+                "printable_name": "Xia"
+            },
+            "unknown": null
+        }
     """
     serializer_class = ProfileSerializer
+    slugs_param = 'slugs'
+
+    def get_slugs(self):
+        slugs = []
+        for value in self.request.GET.getlist(self.slugs_param):
+            for slug in value.split(','):
+                slug = slug.strip()
+                if slug and slug not in slugs:
+                    slugs += [slug]
+        if len(slugs) > settings.PROFILE_BATCH_MAX_SLUGS:
+            raise ValidationError({self.slugs_param: _(
+                "cannot request more than %(max_slugs)d profiles at once.") % {
+                'max_slugs': settings.PROFILE_BATCH_MAX_SLUGS}})
+        return slugs
+
+    def get_accessible_filter(self):
+        """
+        Returns a filter on profiles that are accessible to the request user,
+        using the same rules as `saas.decorators.fail_provider` on GET,
+        or `None` when all profiles are accessible.
+        """
+        if saas_settings.BYPASS_PERMISSION_CHECK:
+            return None
+        accessible_ids = set(get_role_model().objects.valid_for(
+            user=self.request.user, role_description__slug__in=(
+                saas_settings.MANAGER, saas_settings.CONTRIBUTOR)).values_list(
+            'organization_id', flat=True))
+        if get_current_broker().pk in accessible_ids:
+            return None
+        return (Q(pk__in=accessible_ids) |
+            Q(pk__in=Subscription.objects.valid_for(
+                plan__organization__in=accessible_ids).values(
+                'organization_id')))
+
+    def get_queryset(self):
+        queryset = super(DjaoAppProfileBatchAPIView, self).get_queryset(
+            ).filter(slug__in=self.get_slugs())
+        accessible_filter = self.get_accessible_filter()
+        if accessible_filter is not None:
+            queryset = queryset.filter(accessible_filter)
+        return queryset
+
+    @extend_schema(responses={
+        200: OpenApiResponse({
+            'type': 'object',
+            'description': "Profiles keyed by slug (`null` when the profile"\
+                " does not exist or is not accessible)",
+            'additionalProperties': {
+                'allOf': [{'$ref': '#/components/schemas/Profile'}],
+                'nullable': True,
+            },
+        })})
+    def get(self, request, *args, **kwargs):
+        #pylint:disable=unused-argument
+        slugs = self.get_slugs()
+        profiles = self.decorate_personal(list(self.get_queryset()))
+        serializer = self.get_serializer(profiles, many=True)
+        results = dict.fromkeys(slugs)
+        results.update({
+            profile.slug: data
+            for profile, data in zip(profiles, serializer.data)})
+        return Response(results)
 
 
 class DjaoAppProfilePictureAPIView(ProfileDecorateMixin,
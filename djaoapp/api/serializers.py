@@ -1,9 +1,8 @@
-# Copyright (c) 2025 DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 
-import logging, sys
+import logging
 
-from django_recaptcha import client
 from django_recaptcha.constants import TEST_PRIVATE_KEY, TEST_PUBLIC_KEY
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -22,7 +21,9 @@ from signup.serializers import ActivitySerializer as UserActivitySerializer
 from signup.serializers import UserCreateSerializer
 from signup.serializers_overrides import UserDetailSerializer
 
-from ..compat import gettext_lazy as _, six
+from ..compat import gettext_lazy as _
+from ..invoice_keys import exclude_claimed_invoice_keys
+from ..recaptcha import RECAPTCHA_ERRORS, get_verifier
 from ..utils import get_contact_captcha_keys
 from ..validators import validate_contact_form
 
@@ -206,9 +207,11 @@ class SessionSerializer(serializers.ModelSerializer):
     def get_invoice_keys(self, request):
         rule = self.context.get('rule', None)
         if rule and rule.rule_op >= 1: # XXX Authenticated
-            return [result['invoice_key']
+            # Keys waiting to be cleared were already passed
+            # to the upstream application.
+            return exclude_claimed_invoice_keys([result['invoice_key']
                 for result in ChargeItem.objects.to_sync(request.user).values(
-                    'invoice_key').distinct()]
+                    'invoice_key').distinct()])
         return []
 
     @staticmethod
@@ -271,6 +274,8 @@ class DetailSerializer(NoModelSerializer):
 
 @deconstructible
 class ReCaptchaValidator(object):
+    requires_context = True
+
     error_messages = {
         "captcha_invalid": _("Error verifying reCAPTCHA, please try again."),
         "captcha_error": _("Error verifying reCAPTCHA, please try again."),
@@ -293,29 +298,27 @@ class ReCaptchaValidator(object):
             settings, "RECAPTCHA_PUBLIC_KEY", TEST_PUBLIC_KEY)
 
     @staticmethod
-    def get_remote_ip():
-        frm = sys._getframe() #pylint:disable=protected-access
-        while frm:
-            request = frm.f_locals.get("request")
-            if request:
-                remote_ip = request.META.get("REMOTE_ADDR", "")
-                forwarded_ip = request.META.get("HTTP_X_FORWARDED_FOR", "")
-                ip_addr = remote_ip if not forwarded_ip else forwarded_ip
-                return ip_addr
-            frm = frm.f_back
-
-    def __call__(self, value):
+    def get_remote_ip(request):
+        if not request:
+            return None
+        remote_ip = request.META.get("REMOTE_ADDR", "")
+        forwarded_ip = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        return remote_ip if not forwarded_ip else forwarded_ip
+
+    def __call__(self, value, serializer_field):
         """
         Validate that the input contains a valid Re-Captcha value.
+
+        The request is looked up in the context of *serializer_field*.
         """
+        request = serializer_field.context.get('request')
         try:
-            check_captcha = client.submit(
-                recaptcha_response=value,
-                private_key=self.private_key,
-                remoteip=self.get_remote_ip(),
-            )
-
-        except six.moves.urllib.error.HTTPError:  # Catch timeouts, etc
+            check_captcha = get_verifier()(
+                value, self.private_key,
+                remoteip=self.get_remote_ip(request))
+        except RECAPTCHA_ERRORS as err:  # Catch timeouts, etc
+            LOGGER.warning("ReCAPTCHA could not be verified: %r", err,
+                extra={'event': 'recaptcha-error'})
             raise ValidationError(
                 self.error_messages["captcha_error"],
                 code="captcha_error"
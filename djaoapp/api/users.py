@@ -1,29 +1,29 @@
-# Copyright (c) 2023, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 from __future__ import unicode_literals
 
 import logging
-from operator import itemgetter
 
-from django.contrib.auth import get_user_model
 from rest_framework.generics import ListAPIView
 
 from saas import humanize
-from saas.models import get_broker, Charge
+from saas.models import get_broker
 from saas.metrics.base import generate_periods
 from saas.utils import get_role_model
 from signup.api.users import (OTPChangeAPIView as OTPChangeBaseAPIView,
     UserDetailAPIView as UserDetailBaseAPIView,
     UserNotificationsAPIView as UserNotificationsBaseAPIView)
 
-from ..mixins import NotificationsMixin
+from ..activities import get_recent_activities
+from ..mixins import (ConditionalGetMixin, NotificationsMixin,
+    SparseFieldsMixin)
 from .serializers import RecentActivitySerializer
-from ..compat import gettext_lazy as _
 
 LOGGER = logging.getLogger(__name__)
 
 
-class DjaoAppUserDetailAPIView(UserDetailBaseAPIView):
+class DjaoAppUserDetailAPIView(ConditionalGetMixin, SparseFieldsMixin,
+                               UserDetailBaseAPIView):
     """
     Retrieves a user account
 
@@ -33,6 +33,9 @@ class DjaoAppUserDetailAPIView(UserDetailBaseAPIView):
     `contact information page </docs/guides/themes/#dashboard_profile>`_
     as present in the default theme.
 
+    Only the fields listed in ``fields`` (comma-separated) are returned
+    when it is present (ex: ``?fields=slug,printable_name,picture``).
+
     **Tags: profile, user, usermodel
 
     **Example
@@ -55,6 +58,9 @@ class DjaoAppUserDetailAPIView(UserDetailBaseAPIView):
         }
     """
 
+    def get_etag_version_keys(self):
+        return ['user:%s' % self.kwargs.get(self.user_url_kwarg)]
+
     def delete_records(self, user):
         # We will archive the user record to keep audit foreign keys
         # in place but we delete the roles on organizations
@@ -155,31 +161,7 @@ class RecentActivityAPIView(ListAPIView):
 
     def get_queryset(self):
         start_at = generate_periods(humanize.DAILY)[0]
-        users = get_user_model().objects.filter(
-            last_login__gt=start_at).order_by('-last_login')[:5]
-        charges = Charge.objects.filter(
-            created_at__gt=start_at).order_by('-created_at')[:5]
-        data = {}
-        for user in users:
-            data[user.username] = {
-                'printable_name': (user.get_full_name() if user.get_full_name()
-                    else user.username),
-                'descr': _('recently logged in'), 'slug': user.username,
-                'created_at': user.last_login, 'type': "user"}
-        for charge in charges:
-            if charge.state == charge.DONE:
-                descr = _('charge paid')
-            elif charge.state == charge.FAILED:
-                descr = _('charge failed')
-            else:
-                continue
-            data[charge.customer.slug] = {'printable_name':
-                charge.customer.printable_name, 'descr': descr,
-                'created_at': charge.created_at,
-                # TODO 404 for some of the slugs
-                'slug': charge.customer.slug}
-        data = sorted(data.values(), key=itemgetter('printable_name'))
-        return data
+        return get_recent_activities(start_at=start_at)
 
 
 class DjaoAppUserOTPAPIView(OTPChangeBaseAPIView):
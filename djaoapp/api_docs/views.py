@@ -1,4 +1,4 @@
-# Copyright (c) 2025, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 
 """
@@ -6,10 +6,12 @@ Default start page for a djaodjin-hosted product.
 """
 #pylint:disable=too-many-lines
 
-import json, logging, warnings
+import json, logging, os, tempfile, threading, warnings
 from collections import OrderedDict
 
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.safestring import mark_safe
 from django.views.generic import TemplateView
 from rest_framework.request import Request as HttpRequest
 
@@ -18,19 +20,68 @@ from .schemas import (APIDocGenerator, NotificationDocGenerator,
 
 LOGGER = logging.getLogger(__name__)
 
+_artifacts_lock = threading.Lock()
+_artifacts = {}
+
+
+def get_docs_artifact_path(artifact_name):
+    return os.path.join(settings.API_DOCS_ARTIFACT_DIR,
+        '%s-%s.json' % (artifact_name, settings.APP_VERSION))
+
+
+def write_docs_artifact(path, docs):
+    """
+    Writes *docs* to *path* such that a concurrent reader never sees
+    a partially written file.
+    """
+    dirname = os.path.dirname(path)
+    os.makedirs(dirname, exist_ok=True)
+    file_d, tmp_path = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    try:
+        with os.fdopen(file_d, 'w') as tmp_file:
+            json.dump(docs, tmp_file, cls=DjangoJSONEncoder)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    # `mkstemp` creates files only readable by their owner.
+    os.chmod(path, 0o644)
+
+
+def mark_docs_safe(docs):
+    """
+    Marks again as safe the HTML fragments in *docs* since the information
+    is lost when the docs model is serialized to JSON.
+    """
+    for api_end_point in docs['api_end_points']:
+        api_end_point['description'] = mark_safe(api_end_point['description'])
+        for example in api_end_point['examples']:
+            if 'resp' in example:
+                example['resp'] = mark_safe(example['resp'])
+    return docs
+
 
 class APIDocView(TemplateView):
+    """
+    Reference documentation for the API.
 
+    The docs model (end points with their descriptions and examples
+    rendered as HTML, tags and definitions) does not change for a given
+    `APP_VERSION`. It is generated once, at build time, into a JSON artifact
+    in `API_DOCS_ARTIFACT_DIR` (see `manage.py generate_api_docs`), then
+    served from that artifact. Until the artifact exists, the docs model
+    is generated on every request, as it was before artifacts.
+    """
     template_name = 'api_docs/index.html'
     generator = APIDocGenerator()
+    artifact_name = 'api-docs'
 
-    def get_context_data(self, **kwargs):
+    def get_docs(self, request=None):
+        """
+        Returns the docs model generated from the API schema.
+        """
         #pylint:disable=too-many-locals,too-many-nested-blocks
-        context = super(APIDocView, self).get_context_data(**kwargs)
-        request = HttpRequest(self.request)
         api_end_points = []
-        api_base_url = getattr(settings, 'API_BASE_URL',
-            request.build_absolute_uri(location='/').strip('/'))
         schema = self.generator.get_schema(request=request, public=True)
         tags = set([])
         paths = schema.get('paths', [])
@@ -85,17 +136,54 @@ class APIDocView(TemplateView):
                 expanded_tags.update({tag: ""})
 
         if hasattr(self.generator, 'registry'):
-            context.update({'definitions': self.generator.registry})
+            definitions = self.generator.registry.build({}).get('schemas', {})
         else:
             # XXX No schema.definitions in restframework,
-            context.update({'definitions': {}})
+            definitions = {}
 
-        context.update({
+        return {
             'api_end_points': sorted(
                 api_end_points, key=lambda val: val['path']),
+            'tags': expanded_tags,
+            'definitions': definitions,
+        }
+
+    def get_docs_from_artifact(self):
+        """
+        Returns the docs model from the artifact for the current
+        `APP_VERSION`, or `None` if the artifact was not generated.
+        """
+        path = get_docs_artifact_path(self.artifact_name)
+        with _artifacts_lock:
+            docs = _artifacts.get(path)
+        if docs is None:
+            # Concurrent requests might all load the artifact the first time,
+            # but none of them waits for another.
+            try:
+                with open(path) as artifact:
+                    docs = mark_docs_safe(json.load(artifact))
+            except FileNotFoundError:
+                LOGGER.warning("API docs artifact %s is missing"\
+                    " (see `manage.py generate_api_docs`)", path)
+                return None
+            with _artifacts_lock:
+                docs = _artifacts.setdefault(path, docs)
+        return docs
+
+    def get_context_data(self, **kwargs):
+        context = super(APIDocView, self).get_context_data(**kwargs)
+        docs = None
+        if self.artifact_name:
+            docs = self.get_docs_from_artifact()
+        if docs is None:
+            docs = self.get_docs(request=HttpRequest(self.request))
+        api_end_points = docs['api_end_points']
+        context.update({
+            'api_end_points': api_end_points,
             'api_end_points_by_summary': sorted(
                 api_end_points, key=lambda val: val.get('summary', "")),
-            'tags': expanded_tags,
+            'tags': docs['tags'],
+            'definitions': docs['definitions'],
 #            'api_base_url': api_base_url,
             'api_base_url': "{{api_base_url}}",
          'api_jwt_user': "<a href=\"#auth_create\">JWT auth token</a>",
@@ -112,3 +200,5 @@ class NotificationDocView(APIDocView):
     """
     template_name = 'api_docs/notifications.html'
     generator = NotificationDocGenerator()
+    # Examples are built from the host name in the request.
+    artifact_name = None
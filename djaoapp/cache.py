@@ -0,0 +1,236 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Cache backend and helpers shared by the caches in djaoapp.
+
+Values are stored through `CACHES['default']`, which is a `TieredCache`:
+a per-process local-memory cache (L1) in front of a cache shared
+between processes (L2). Keys are prefixed by `APP_NAME` and versioned
+by `APP_VERSION` (see `CACHES` in settings.py), and the helpers
+in this module further prefix keys by the current multitier site such that
+two sites never share cached values.
+
+Values derived from the records of a database are instead prefixed
+by the database alias (helpers called with *using*), such that they can be
+invalidated from the records themselves, including outside of a request
+(ex: signals triggered by a management command) where there is no current
+site. Outside of a request, site-prefixed keys require an explicit *site*.
+"""
+from __future__ import unicode_literals
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches, cache as default_cache
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.functional import cached_property
+from multitier.routers import SiteRouter
+from multitier.thread_locals import get_current_site
+
+from .routers import get_primary_alias
+
+_MISSING = object()
+
+
+class TieredCache(BaseCache):
+    """
+    Local-memory cache (L1) in front of a shared cache (L2).
+
+    `OPTIONS` are:
+
+    - `L2`: alias in `CACHES` of the shared cache
+    - `L1_TIMEOUT`: number of seconds a value is kept in the L1 cache
+    - `L1_MAX_ENTRIES`: maximum number of values kept in the L1 cache
+
+    Values are written through to the L2 cache. Since the L1 cache
+    of other processes is not invalidated, a process might return a stale
+    value for at most `L1_TIMEOUT` seconds after it was updated or deleted
+    by another process.
+    """
+    def __init__(self, location, params):
+        super(TieredCache, self).__init__(params)
+        options = params.get('OPTIONS', {})
+        self.l2_alias = options.get('L2')
+        self.l1_timeout = options.get('L1_TIMEOUT', 5)
+        self.l1 = LocMemCache(location, {
+            'TIMEOUT': self.l1_timeout,
+            'KEY_PREFIX': params.get('KEY_PREFIX', ''),
+            'VERSION': params.get('VERSION', 1),
+            'KEY_FUNCTION': params.get('KEY_FUNCTION'),
+            'OPTIONS': {
+                'MAX_ENTRIES': options.get('L1_MAX_ENTRIES', 1000)
+            }
+        })
+
+    @cached_property
+    def l2(self):
+        return caches[self.l2_alias]
+
+    def _get_l1_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.l1_timeout
+        return min(timeout, self.l1_timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout=timeout, version=version)
+        if added:
+            self.l1.set(key, value,
+                timeout=self._get_l1_timeout(timeout), version=version)
+        return added
+
+    def get(self, key, default=None, version=None):
+        value = self.l1.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            value = self.l2.get(key, _MISSING, version=version)
+            if value is _MISSING:
+                return default
+            self.l1.set(key, value, version=version)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout=timeout, version=version)
+        self.l1.set(key, value,
+            timeout=self._get_l1_timeout(timeout), version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        return (self.l1.has_key(key, version=version) or
+            self.l2.has_key(key, version=version))
+
+    def incr(self, key, delta=1, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.incr(key, delta=delta, version=version)
+
+    def get_many(self, keys, version=None):
+        values = self.l1.get_many(keys, version=version)
+        missing = [key for key in keys if key not in values]
+        if missing:
+            l2_values = self.l2.get_many(missing, version=version)
+            self.l1.set_many(l2_values, version=version)
+            values.update(l2_values)
+        return values
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed_keys = self.l2.set_many(data, timeout=timeout, version=version)
+        self.l1.set_many(data,
+            timeout=self._get_l1_timeout(timeout), version=version)
+        return failed_keys
+
+    def delete_many(self, keys, version=None):
+        self.l1.delete_many(keys, version=version)
+        self.l2.delete_many(keys, version=version)
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+
+def get_site_cache_key(key, site=None):
+    """
+    Returns *key* prefixed by *site* (defaults to the current site).
+    """
+    if site is None:
+        site = get_current_site()
+        if site is None:
+            # Without a site, keys would not match the ones used
+            # while serving requests.
+            raise RuntimeError("no current site to prefix cache key '%s'"\
+                " with (outside of a request?)" % key)
+    return '%s:%s' % (site.slug, key)
+
+
+def get_db_alias(using=None):
+    """
+    Returns the alias of the database *using* (defaults to the database
+    of the current site), or of its primary when *using* is a read replica.
+    """
+    if using is None:
+        using = SiteRouter.provider_db()
+    return get_primary_alias(using or DEFAULT_DB_ALIAS)
+
+
+def get_db_cache_key(key, using=None):
+    """
+    Returns *key* prefixed by the database *using* (defaults to the database
+    of the current site).
+    """
+    return 'db.%s:%s' % (get_db_alias(using), key)
+
+
+def _get_cache_key(key, site=None, using=None):
+    if using is not None:
+        return get_db_cache_key(key, using=using)
+    return get_site_cache_key(key, site=site)
+
+
+def cache_get(key, default=None, site=None, using=None):
+    return default_cache.get(
+        _get_cache_key(key, site=site, using=using), default)
+
+
+def cache_set(key, value, timeout=DEFAULT_TIMEOUT, site=None, using=None):
+    default_cache.set(_get_cache_key(key, site=site, using=using), value,
+        timeout=timeout)
+
+
+def cache_get_or_set(key, default, timeout=DEFAULT_TIMEOUT, site=None,
+                     using=None):
+    """
+    Returns the value cached under *key*. If there is none, *default*
+    is called, and its result is cached and returned.
+    """
+    cache_key = _get_cache_key(key, site=site, using=using)
+    value = default_cache.get(cache_key, _MISSING)
+    if value is _MISSING:
+        value = default()
+        default_cache.set(cache_key, value, timeout=timeout)
+    return value
+
+
+def cache_delete(key, site=None, using=None):
+    """
+    Removes the value cached under *key*.
+
+    When *using* is specified, the value is removed after the current
+    transaction on that database commits, such that a concurrent request
+    does not cache again the state from before the transaction.
+    """
+    cache_key = _get_cache_key(key, site=site, using=using)
+    if using:
+        transaction.on_commit(
+            lambda: default_cache.delete(cache_key), using=get_db_alias(using))
+    else:
+        default_cache.delete(cache_key)
+
+
+def get_version_token(key, using=None):
+    """
+    Returns an opaque token that changes every time `bump_version_token`
+    is called for *key* on the database *using* (defaults to the database
+    of the current site).
+
+    Tokens expire after `CACHE_VERSION_TOKEN_TIMEOUT` seconds such that
+    changes that do not trigger a bump (ex: `QuerySet.update()`) are
+    eventually picked up.
+    """
+    return cache_get_or_set('version:%s' % key, lambda: uuid.uuid4().hex,
+        timeout=settings.CACHE_VERSION_TOKEN_TIMEOUT,
+        using=get_db_alias(using))
+
+
+def bump_version_token(key, using):
+    """
+    Changes the token returned by `get_version_token` for *key*
+    once the current transaction on the database *using* commits.
+    """
+    cache_delete('version:%s' % key, using=using)
@@ -0,0 +1,120 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Persistent connections to tenant databases.
+
+With `CONN_MAX_AGE` set, Django keeps the connection to a database open
+across requests, and checks it is still usable before re-using it
+(`CONN_HEALTH_CHECKS`). Since multitier adds a database per site on the fly,
+a worker would eventually hold a connection to every tenant database
+it has served. Here we keep track of the databases each worker thread
+recently used, and close the least recently used connections
+when more than `DB_MAX_CONNECTIONS` are open.
+"""
+from __future__ import unicode_literals
+
+import logging, threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connections
+
+LOGGER = logging.getLogger(__name__)
+
+_thread_locals = threading.local() #pylint: disable=invalid-name
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def _get_pool():
+    pool = getattr(_thread_locals, 'pool', None)
+    if pool is None:
+        # alias -> set when the connection was used by the current request
+        _thread_locals.pool = OrderedDict()
+        _thread_locals.created = set()
+        pool = _thread_locals.pool
+    return pool
+
+
+def _mark_used(execute, sql, params, many, context):
+    _get_pool()[context['connection'].alias] = True
+    return execute(sql, params, many, context)
+
+
+def _increment_stats(**kwargs):
+    with _stats_lock:
+        for key, val in kwargs.items():
+            _stats[key] += val
+
+
+def get_connection_stats():
+    """
+    Returns the number of times a request re-used an open connection
+    (hits), had to open a new connection (misses), and the number of
+    connections closed to keep under `DB_MAX_CONNECTIONS` (evictions).
+    """
+    with _stats_lock:
+        stats = _stats.copy()
+    nb_uses = stats['hits'] + stats['misses']
+    stats.update({
+        'hit_rate': (float(stats['hits']) / nb_uses) if nb_uses else 0.0})
+    return stats
+
+
+def connection_opened(connection):
+    """
+    Records a new connection to a database has been opened.
+    """
+    _get_pool()
+    _thread_locals.created.add(connection.alias)
+    if _mark_used not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_mark_used)
+
+
+def release_connections():
+    """
+    Updates the pool statistics with the databases used while serving
+    the request that just finished, then closes the least recently used
+    connections when more than `DB_MAX_CONNECTIONS` are open.
+    """
+    pool = _get_pool()
+    created = _thread_locals.created
+    hits = 0
+    misses = 0
+    for alias, used in list(pool.items()):
+        if used:
+            if alias in created:
+                misses += 1
+            else:
+                hits += 1
+            pool.move_to_end(alias)
+            pool[alias] = False
+    created.clear()
+
+    evictions = 0
+    open_aliases = [alias for alias in pool
+        if connections[alias].connection is not None]
+    for alias in open_aliases[:max(
+            0, len(open_aliases) - settings.DB_MAX_CONNECTIONS)]:
+        LOGGER.debug("closing least recently used connection to '%s'", alias)
+        connections[alias].close()
+        del pool[alias]
+        evictions += 1
+    # Connections that were closed by Django (ex: `CONN_MAX_AGE` expired)
+    # are removed from the pool.
+    for alias in list(pool.keys()):
+        if connections[alias].connection is None:
+            del pool[alias]
+
+    if hits or misses or evictions:
+        _increment_stats(hits=hits, misses=misses, evictions=evictions)
+        if misses or evictions:
+            stats = get_connection_stats()
+            LOGGER.debug("db connections: %d hits, %d misses (%.2f hit rate),"\
+                " %d evictions", stats['hits'], stats['misses'],
+                stats['hit_rate'], stats['evictions'],
+                extra={'event': 'db-connections',
+                    'nb_hits': stats['hits'], 'nb_misses': stats['misses'],
+                    'nb_evictions': stats['evictions']})
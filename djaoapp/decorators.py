@@ -1,4 +1,4 @@
-# Copyright (c) 2023, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 from __future__ import absolute_import
 from __future__ import unicode_literals
@@ -17,8 +17,11 @@ from saas.utils import get_role_model
 from signup.helpers import has_invalid_password
 from signup.models import Contact
 
-from .compat import reverse, available_attrs
+from .compat import available_attrs, reverse
 from .edition_tools import inject_edition_tools as _inject_edition_tools
+from .perms import (#pylint:disable=unused-import
+    fail_direct, fail_provider, fail_provider_only, fail_self_provider,
+    log_permissions_memo)
 
 # This logger is really only useful for 'rules' in debug mode.
 LOGGER = logging.getLogger('rules')
@@ -54,6 +57,8 @@ def inject_edition_tools(function=None):
                 # str(soup) instead of soup.prettify() to avoid
                 # trailing whitespace on a reformatted HTML textarea
                 response.content = str(soup)
+            log_permissions_memo(request,
+                getattr(view_func, 'view_class', view_func).__name__)
             return response
         return _wrapped_view
 
@@ -15,13 +15,13 @@ from extended_templates.models import get_show_edit_tools
 from extended_templates.views.pages import (
     inject_edition_tools as inject_edition_tools_base)
 from rules.utils import get_current_app
-from saas.decorators import _valid_manager
 from saas.models import get_broker, is_broker
 from saas.templatetags.saas_tags import attached_organization
 from saas.utils import get_role_model
 
 from .compat import csrf, is_authenticated, reverse
 from .api.serializers import PublicSessionSerializer
+from .utils import valid_manager
 
 
 LOGGER = logging.getLogger(__name__)
@@ -43,9 +43,7 @@ def fail_edit_perm(request, account=None):
             # The call to `get_current_app` here seems valid to check
             # if the user has permissions to edit pages under a path prefix.
             account = get_current_app(request).account
-        result = not bool(_valid_manager(
-            request.user if is_authenticated(request) else None,
-            [account]))
+        result = not bool(valid_manager(request, [account]))
     return result
 
 
@@ -1,16 +1,60 @@
-# Copyright (c) 2023, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 
 from __future__ import absolute_import
 
+import copy
+
 from extended_templates.extras import AccountMixinBase
 from rules.extras import AppMixinBase
 from rules.utils import get_current_app
 from signup.helpers import has_invalid_password, update_context_urls
 
+from ..cache import cache_get_or_set
 from ..compat import reverse
 
 
+def _get_personal_profile_urls(username, organization):
+    """
+    Returns the URLs used in the personal profile pages
+    of *username* / *organization*.
+    """
+    return {
+        # The following are copy/pasted
+        # from `signup.UserProfileView`
+        # to be used in the personal profile page.
+        'api_recover': reverse('api_recover'),
+        'user': {
+            'api_generate_keys': reverse(
+                'api_generate_keys', args=(username,)),
+            'api_profile': reverse(
+                'api_user_profile', args=(username,)),
+            'api_password_change': reverse(
+                'api_user_password_change', args=(username,)),
+            'api_otp_change': reverse(
+                'api_user_otp_change', args=(username,)),
+            'api_profile_picture': reverse(
+                'saas_api_organization_picture', args=(organization,)),
+            'api_contact': reverse(
+                'api_contact', args=(username,)), #XXX
+            'api_pubkey': reverse(
+                'api_pubkey', args=(username,)),
+            'otp_update': reverse(
+                'otp_update', args=(username,)),
+            'password_change': reverse(
+                'password_change', args=(username,)),
+            'keys_update': reverse(
+                'pubkey_update', args=(username,)),
+
+            # For sidebar menu items on personal profiles.
+            'accessibles': reverse(
+                'saas_user_product_list', args=(username,)),
+            'notifications': reverse(
+                'users_notifications', args=(username,)),
+            'profile': reverse('users_profile', args=(username,)),
+    }}
+
+
 class ExtraMixin(AppMixinBase, AccountMixinBase):
 
     # matches definition in `saas.backends.stripe_processor.base.StripeBackend`.
@@ -77,62 +121,29 @@ class ExtraMixin(AppMixinBase, AccountMixinBase):
         # `OrganizationMixin.get_context_data` had an opportunity to
         # add the organization to the `context`, so we call
         # `OrganizationMixin.organization` here. hmmm.
-        user = self.organization.attached_user()
+        user = self.get_attached_user_with_contact()
         if user:
             # The following are copy/pasted
             # from `signup.UserProfileView`
             # to be used in the personal profile page.
             setattr(user, 'full_name', user.get_full_name())
-            primary_contact = user.contacts.filter(
-                email__iexact=user.email).order_by('created_at').first()
-            if primary_contact:
+            if user.primary_contact_pk:
                 context.update({
-                    'email_verified_at': primary_contact.email_verified_at,
-                    'phone_verified_at': primary_contact.phone_verified_at
+                    'email_verified_at': user.primary_email_verified_at,
+                    'phone_verified_at': user.primary_phone_verified_at
                 })
-            if primary_contact and primary_contact.picture:
-                setattr(user, 'picture', primary_contact.picture)
-            else:
-                picture_candidate = user.contacts.filter(
-                    picture__isnull=False).order_by('created_at').first()
-                if picture_candidate:
-                    setattr(user, 'picture', picture_candidate.picture)
-
-            update_context_urls(context, {
-                # The following are copy/pasted
-                # from `signup.UserProfileView`
-                # to be used in the personal profile page.
-                'api_recover': reverse('api_recover'),
-                'user': {
-                    'api_generate_keys': reverse(
-                        'api_generate_keys', args=(user,)),
-                    'api_profile': reverse(
-                        'api_user_profile', args=(user,)),
-                    'api_password_change': reverse(
-                        'api_user_password_change', args=(user,)),
-                    'api_otp_change': reverse(
-                        'api_user_otp_change', args=(user,)),
-                    'api_profile_picture': reverse(
-                        'saas_api_organization_picture', args=(
-                        self.organization,)),
-                    'api_contact': reverse(
-                        'api_contact', args=(user.username,)), #XXX
-                    'api_pubkey': reverse(
-                        'api_pubkey', args=(user,)),
-                    'otp_update': reverse(
-                        'otp_update', args=(user,)),
-                    'password_change': reverse(
-                        'password_change', args=(user,)),
-                    'keys_update': reverse(
-                        'pubkey_update', args=(user,)),
-
-                    # For sidebar menu items on personal profiles.
-                    'accessibles': reverse(
-                        'saas_user_product_list', args=(user,)),
-                    'notifications': reverse(
-                        'users_notifications', args=(user,)),
-                    'profile': reverse('users_profile', args=(user,)),
-            }})
+            if user.primary_contact_pk and user.primary_picture:
+                setattr(user, 'picture', user.primary_picture)
+            elif user.fallback_picture is not None:
+                setattr(user, 'picture', user.fallback_picture)
+
+            # The URLs are copied because `update_context_urls` will merge
+            # further URLs into the dictionnaries it is passed.
+            update_context_urls(context, copy.deepcopy(cache_get_or_set(
+                'personal_profile_urls:%s:%s' % (
+                    user.username, self.organization.slug),
+                lambda: _get_personal_profile_urls(
+                    user.username, self.organization.slug))))
             # The following are copy/pasted
             # from `signup.UserProfileView`
             # to be used in the personal profile page.
@@ -142,13 +153,44 @@ class ExtraMixin(AppMixinBase, AccountMixinBase):
                         'api_user_activate', args=(user,)),
                 }})
 
-            from signup.models import OTPGenerator
-            context.update({
-                'otp_enabled': OTPGenerator.objects.filter(
-                    user=user).exists()})
+            context.update({'otp_enabled': user.otp_enabled})
 
         return context
 
+    def get_attached_user_with_contact(self):
+        """
+        Returns the same ``User`` as ``attached_user()`` annotated
+        with fields from its primary contact and a flag for OTP in a single
+        SQL query.
+        """
+        # Implementation Note: `djaoapp.extras` is imported from settings.py
+        # so models must be imported when the method is called.
+        #pylint:disable=import-outside-toplevel
+        from django.contrib.auth import get_user_model
+        from django.db.models import Exists, OuterRef, Subquery
+        from signup.models import Contact, OTPGenerator
+
+        primary_contacts = Contact.objects.filter(user=OuterRef('pk'),
+            email__iexact=OuterRef('email')).order_by('created_at')
+        picture_candidates = Contact.objects.filter(user=OuterRef('pk'),
+            picture__isnull=False).order_by('created_at')
+        #pylint:disable=protected-access
+        return get_user_model().objects.db_manager(
+            using=self.organization._state.db).filter(
+            role__organization=self.organization,
+            username=self.organization.slug).annotate(
+            primary_contact_pk=Subquery(
+                primary_contacts.values('pk')[:1]),
+            primary_email_verified_at=Subquery(
+                primary_contacts.values('email_verified_at')[:1]),
+            primary_phone_verified_at=Subquery(
+                primary_contacts.values('phone_verified_at')[:1]),
+            primary_picture=Subquery(
+                primary_contacts.values('picture')[:1]),
+            fallback_picture=Subquery(
+                picture_candidates.values('picture')[:1]),
+            otp_enabled=Exists(
+                OTPGenerator.objects.filter(user=OuterRef('pk')))).first()
 
     def update_attached_user(self, user, validated_data):
         from signup.models import get_user_contact
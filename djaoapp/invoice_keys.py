@@ -0,0 +1,149 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Deferred clearing of the invoice keys passed to upstream applications.
+
+Invoice keys of paid charges a 3rd party asked to be notified about
+are added to the session forwarded to the upstream application
+(see `djaoapp.api.serializers.SessionSerializer`). Once the upstream
+responded HTTP 200 OK to a request carrying them, we assume it
+synchronized whichever state necessary, and the keys must not be
+sent again.
+
+Instead of updating the `ChargeItem` while serving the proxied page,
+the keys are claimed in the `shared` cache for
+`INVOICE_KEYS_CLAIM_TIMEOUT` seconds. The first request to claim
+a key schedules it to be cleared; requests that find it already claimed
+do nothing, and sessions built in the meantime leave it out. Scheduled
+keys are cleared in a single UPDATE per database when the request that
+scheduled them finishes, i.e. after its response was sent, along with
+keys scheduled by concurrent requests in the same process.
+
+Claims only hold across workers when the `shared` cache is shared
+between processes (ex: memcached, redis). With a local-memory `shared`
+cache, workers each clear the keys they were passed, which is harmless
+since clearing an already cleared key is a no-op.
+
+A key that was claimed but not cleared (ex: the worker was killed before
+the request finished, or the database was unavailable) is sent to the
+upstream again, and claimed again, once its claim expired.
+"""
+from __future__ import unicode_literals
+
+import logging, threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+from multitier.routers import SiteRouter
+from saas.models import ChargeItem
+
+from .cache import get_site_cache_key
+
+LOGGER = logging.getLogger(__name__)
+
+_pending_lock = threading.Lock()
+# database alias -> set of invoice keys to clear
+_pending = {}
+
+_stats_lock = threading.Lock()
+_stats = {'claimed': 0, 'skipped': 0, 'flushes': 0, 'cleared': 0,
+    'errors': 0}
+
+
+def _increment_stats(**kwargs):
+    with _stats_lock:
+        for key, val in kwargs.items():
+            _stats[key] += val
+
+
+def get_invoice_keys_stats():
+    """
+    Returns the number of invoice keys claimed, the number of keys
+    skipped because they were already claimed, the number of flushes
+    and failed flushes (errors), and the number of `ChargeItem` cleared.
+    """
+    with _stats_lock:
+        return _stats.copy()
+
+
+def _get_claim_key(invoice_key):
+    return get_site_cache_key('invoice_key_synced:%s' % invoice_key)
+
+
+def exclude_claimed_invoice_keys(invoice_keys):
+    """
+    Returns the keys in *invoice_keys* that were not claimed yet.
+    """
+    if not invoice_keys:
+        return invoice_keys
+    claim_keys = [_get_claim_key(invoice_key) for invoice_key in invoice_keys]
+    try:
+        claimed = caches['shared'].get_many(claim_keys)
+    except Exception as err: #pylint:disable=broad-except
+        LOGGER.warning("cannot look up claimed invoice keys: %r", err,
+            extra={'event': 'invoice-keys-error'})
+        return invoice_keys
+    return [invoice_key
+        for invoice_key, claim_key in zip(invoice_keys, claim_keys)
+        if claim_key not in claimed]
+
+
+def defer_clear_invoice_keys(invoice_keys):
+    """
+    Claims *invoice_keys* and schedules the keys that were not claimed
+    before to be cleared from their `ChargeItem` once the current request
+    finished.
+    """
+    cache = caches['shared']
+    claimed = []
+    for invoice_key in invoice_keys:
+        try:
+            if cache.add(_get_claim_key(invoice_key), True,
+                    timeout=settings.INVOICE_KEYS_CLAIM_TIMEOUT):
+                claimed += [invoice_key]
+        except Exception as err: #pylint:disable=broad-except
+            # Clearing the same keys twice is harmless.
+            LOGGER.warning("cannot claim invoice key: %r", err,
+                extra={'event': 'invoice-keys-error'})
+            claimed += [invoice_key]
+    _increment_stats(claimed=len(claimed),
+        skipped=len(invoice_keys) - len(claimed))
+    if not claimed:
+        return
+    using = SiteRouter().db_for_write(ChargeItem) or DEFAULT_DB_ALIAS
+    with _pending_lock:
+        _pending.setdefault(using, set([])).update(claimed)
+
+
+def flush_invoice_keys():
+    """
+    Clears the scheduled invoice keys from their `ChargeItem`.
+
+    This function is called when a request finished
+    (see `djaoapp.signals`).
+    """
+    with _pending_lock:
+        if not _pending:
+            return
+        pending = _pending.copy()
+        _pending.clear()
+
+    for using, invoice_keys in pending.items():
+        try:
+            nb_cleared = ChargeItem.objects.using(using).filter(
+                invoice_key__in=invoice_keys).update(
+                invoice_key=None, sync_on="")
+            _increment_stats(flushes=1, cleared=nb_cleared)
+            LOGGER.debug("cleared %d invoice keys in '%s' (%d charge items)",
+                len(invoice_keys), using, nb_cleared,
+                extra={'event': 'invoice-keys-cleared', 'using': using,
+                    'nb_invoice_keys': len(invoice_keys),
+                    'nb_charge_items': nb_cleared})
+        except DatabaseError as err:
+            # The keys will be claimed again once their claim expired.
+            _increment_stats(flushes=1, errors=1)
+            LOGGER.warning("cannot clear %d invoice keys in '%s': %r",
+                len(invoice_keys), using, err,
+                extra={'event': 'invoice-keys-error', 'using': using})
@@ -0,0 +1,99 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+import datetime, decimal, io, timeit, uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework.parsers import JSONParser as BaseJSONParser
+from rest_framework.renderers import JSONRenderer as BaseJSONRenderer
+
+from ...compat import gettext_lazy as _
+from ...parsers import JSONParser, orjson
+from ...renderers import JSONRenderer
+
+
+def get_sample_records(nb_records):
+    """
+    Returns *nb_records* records with the types found in API responses
+    that `orjson` does not encode natively (Decimal, lazy translations)
+    along with datetimes and UUIDs.
+    """
+    created_at = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    return {
+        'count': nb_records,
+        'next': None,
+        'previous': None,
+        'results': [{
+            'slug': 'record-%d' % idx,
+            'printable_name': "Record %d" % idx,
+            'amount': decimal.Decimal('%d.%02d' % (idx, idx % 100)),
+            'unit': _("usd"),
+            'created_at': created_at + datetime.timedelta(minutes=idx),
+            'uuid': uuid.UUID(int=idx),
+            'is_active': bool(idx % 2),
+            'ratio': idx / 7,
+            'tags': ['a', 'b', 'c'],
+        } for idx in range(nb_records)]}
+
+
+class Command(BaseCommand):
+    help = "Compare the time to render and parse API responses with"\
+        " the stock REST framework JSON classes and their `orjson`"\
+        " counterparts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*',
+            help='API end points whose responses are benchmarked'\
+            ' (defaults to sample records)')
+        parser.add_argument('--username',
+            action='store', dest='username', default=None,
+            help='user the API end points are called as')
+        parser.add_argument('--records',
+            action='store', dest='records', type=int, default=1000,
+            help='number of sample records')
+        parser.add_argument('--number',
+            action='store', dest='number', type=int, default=100,
+            help='number of times each render and parse is timed')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed.")
+        payloads = []
+        if options['paths']:
+            client = Client()
+            if options['username']:
+                client.force_login(get_user_model().objects.get(
+                    username=options['username']))
+            for path in options['paths']:
+                resp = client.get(path, HTTP_ACCEPT='application/json')
+                if resp.status_code != 200 or not hasattr(resp, 'data'):
+                    raise CommandError("GET %s returned %d" % (
+                        path, resp.status_code))
+                payloads += [(path, resp.data)]
+        else:
+            payloads += [("%d sample records" % options['records'],
+                get_sample_records(options['records']))]
+
+        number = options['number']
+        for name, data in payloads:
+            stock = BaseJSONRenderer().render(data)
+            content = JSONRenderer().render(data)
+            render_stock = timeit.timeit(
+                lambda data=data: BaseJSONRenderer().render(data),
+                number=number) * 1000 / number
+            render_orjson = timeit.timeit(
+                lambda data=data: JSONRenderer().render(data),
+                number=number) * 1000 / number
+            parse_stock = timeit.timeit(
+                lambda: BaseJSONParser().parse(io.BytesIO(content)),
+                number=number) * 1000 / number
+            parse_orjson = timeit.timeit(
+                lambda: JSONParser().parse(io.BytesIO(content)),
+                number=number) * 1000 / number
+            self.stdout.write("%s (%.1fKB, %s)\n"\
+                "  render %.3f -> %.3fms  parse %.3f -> %.3fms" % (
+                name, len(content) / 1024,
+                "identical" if content == stock else "differs",
+                render_stock, render_orjson, parse_stock, parse_orjson))
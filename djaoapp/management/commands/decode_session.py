@@ -1,4 +1,4 @@
-# Copyright (c) 2025, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 
 import logging
@@ -28,6 +28,7 @@ class Command(BaseCommand):
 
 
     def handle(self, *args, **options):
+        site = None
         db_name = options.get('db_name')
         if db_name:
             try:
@@ -44,8 +45,10 @@ class Command(BaseCommand):
                 return 1
         try:
             clear_cache()
-            set_current_site(site, path_prefix='',
-                default_scheme='https', default_host=site.domain)
+            if site:
+                # Sessions are stored (and cached) per site.
+                set_current_site(site, path_prefix='',
+                    default_scheme='https', default_host=site.domain)
             self.decode_sessions(options['session_keys'])
         except DatabaseError as err:
             LOGGER.error(
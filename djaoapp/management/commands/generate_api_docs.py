@@ -0,0 +1,22 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ...api_docs.views import (APIDocView, get_docs_artifact_path,
+    write_docs_artifact)
+
+
+class Command(BaseCommand):
+    help = "Generate the API documentation artifact for the current"\
+        " APP_VERSION."
+
+    def handle(self, *args, **options):
+        view = APIDocView()
+        path = get_docs_artifact_path(view.artifact_name)
+        write_docs_artifact(path, json.loads(json.dumps(
+            view.get_docs(), cls=DjangoJSONEncoder)))
+        self.stdout.write('generated API docs artifact %s' % path)
@@ -1,21 +1,53 @@
-# Copyright (c) 2023, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 
-import json, logging
+import json, logging, os
+from concurrent.futures import ProcessPoolExecutor
 from hashlib import sha256
 
+import django
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from ...api_docs.schemas import format_examples, split_descr_and_examples
-from ...api_docs.views import APIDocGenerator
+from ...api_docs.schemas import (APIDocEndpointEnumerator, format_examples,
+    split_descr_and_examples)
 
 
 LOGGER = logging.getLogger(__name__)
 
 
+def parse_endpoint(path, func, docstring, api_base_url):
+    """
+    Returns the examples parsed from the *docstring* of an API end point,
+    along with the errors found while parsing them.
+    """
+    _, _, description, examples = split_descr_and_examples(
+        docstring, api_base_url=api_base_url)
+    func_examples = format_examples(examples)
+    errors = []
+    if func_examples[0]['path']:
+        if ('responds' not in examples and func != 'delete'):
+            errors.append('missing-response')
+    else:
+        func_examples[0]['path'] = path
+        func_examples[0]['func'] = func
+        if not description and not examples:
+            errors.append('undocumented')
+        else:
+            errors.append('parsing')
+    return {
+        'descr_hash': sha256(description.encode()).hexdigest(),
+        'examples': func_examples,
+        'errors': errors
+    }
+
+
+def _parse_endpoint(args):
+    return parse_endpoint(*args)
+
+
 class Command(BaseCommand):
-    help = "Load the database with random transactions (testing purposes)."
+    help = "Generate examples of API calls from the API documentation."
 
     def add_arguments(self, parser):
         parser.add_argument('--database',
@@ -26,45 +58,112 @@ class Command(BaseCommand):
             help='create sample subscribers on this provider')
         parser.add_argument('--errors', action='store_true', default=False,
             help='toggle errors')
+        parser.add_argument('--manifest', action='store',
+            default=os.path.join(settings.API_DOCS_ARTIFACT_DIR,
+                'api-examples-manifest.json'),
+            help='file where parsed examples are kept between runs'\
+            ' such that only end points with a modified docstring'\
+            ' are parsed again')
+        parser.add_argument('--jobs', action='store', type=int,
+            default=os.cpu_count(),
+            help='number of processes parsing docstrings in parallel')
+
+    @staticmethod
+    def get_docstrings():
+        """
+        Returns (key, path, func, docstring) for each API end point,
+        looking up docstrings the same way
+        `djaoapp.api_docs.schemas.AutoSchema` does.
+        """
+        docstrings = []
+        for path, _, method, callback in \
+                APIDocEndpointEnumerator().get_api_endpoints():
+            view_class = callback.cls
+            func = method.lower()
+            docstring = getattr(view_class, func).__doc__
+            if not docstring:
+                docstring = view_class.__doc__
+            if docstring:
+                docstrings += [('%s %s' % (func, path), path, func,
+                    docstring.strip())]
+        return docstrings
+
+    @staticmethod
+    def load_manifest(manifest_path, api_base_url):
+        try:
+            with open(manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('api_base_url') != api_base_url:
+            return {}
+        return manifest.get('endpoints', {})
 
     def handle(self, *args, **options):
         #pylint:disable=too-many-locals
-        formatted_examples = []
         api_base_url = getattr(settings,
             'API_BASE_URL', 'https://djaodjin.com/api')
-        generator = APIDocGenerator()
-        schema = generator.get_schema(request=None, public=True)
-        descr_hashes = []
-        for path, path_details in schema.paths.items():
-            for func, func_details in path_details.items():
-                try:
-                    func_tags, summary, description, examples = \
-                        split_descr_and_examples(func_details,
-                            api_base_url=api_base_url)
-                    func_examples = format_examples(examples)
-                    hsh = sha256(func_details.description.encode()).hexdigest()
-                    errors = []
-                    if func_examples[0]['path']:
-                        if ('responds' not in examples and func != 'delete'):
-                            errors.append('missing-response')
-                    else:
-                        func_examples[0]['path'] = path
-                        func_examples[0]['func'] = func
-                        if not description and not examples:
-                            errors.append('undocumented')
-                        else:
-                            errors.append('parsing')
-                    if hsh in descr_hashes:
-                        errors.append('duplicate-description')
-                    else:
-                        descr_hashes.append(hsh)
-                    if options['errors']:
-                        if errors:
-                            func_examples[0]['errors'] = errors
-                            formatted_examples += func_examples
-                    else:
-                        if not errors:
-                            formatted_examples += func_examples
-                except AttributeError:
-                    pass
-        self.stdout.write(json.dumps(formatted_examples, indent=2))
+        manifest_path = options['manifest']
+        manifest = self.load_manifest(manifest_path, api_base_url)
+
+        endpoints = {}
+        modified = []
+        for key, path, func, docstring in self.get_docstrings():
+            hsh = sha256(docstring.encode()).hexdigest()
+            entry = manifest.get(key)
+            if entry and entry['hash'] == hsh:
+                endpoints[key] = entry
+            else:
+                endpoints[key] = {'hash': hsh}
+                modified += [(key, (path, func, docstring, api_base_url))]
+        LOGGER.info("parsing %d of %d end points",
+            len(modified), len(endpoints))
+
+        if options['jobs'] > 1 and len(modified) > 1:
+            with ProcessPoolExecutor(max_workers=options['jobs'],
+                    initializer=django.setup) as executor:
+                results = executor.map(_parse_endpoint,
+                    [args for _, args in modified],
+                    chunksize=max(1, len(modified) // (4 * options['jobs'])))
+                for (key, _), result in zip(modified, results):
+                    endpoints[key].update(result)
+        else:
+            for key, args in modified:
+                endpoints[key].update(parse_endpoint(*args))
+
+        if modified or len(endpoints) != len(manifest):
+            manifest_dir = os.path.dirname(manifest_path)
+            if manifest_dir:
+                os.makedirs(manifest_dir, exist_ok=True)
+            with open(manifest_path, 'w') as manifest_file:
+                json.dump({'api_base_url': api_base_url,
+                    'endpoints': endpoints}, manifest_file)
+
+        self.write_examples(endpoints.values(), errors=options['errors'])
+
+    def write_examples(self, endpoints, errors=False):
+        """
+        Writes the examples as a JSON list, one end point at a time.
+        """
+        descr_hashes = set([])
+        sep = "[\n"
+        for endpoint in endpoints:
+            endpoint_errors = list(endpoint['errors'])
+            if endpoint['descr_hash'] in descr_hashes:
+                endpoint_errors.append('duplicate-description')
+            else:
+                descr_hashes.add(endpoint['descr_hash'])
+            func_examples = endpoint['examples']
+            if errors:
+                if not endpoint_errors:
+                    continue
+                func_examples = [dict(func_examples[0],
+                    errors=endpoint_errors)] + func_examples[1:]
+            elif endpoint_errors:
+                continue
+            for example in func_examples:
+                self.stdout.write(sep + "\n".join(["  " + line
+                    for line in json.dumps(example, indent=2).splitlines()]),
+                    ending="")
+                sep = ",\n"
+        self.stdout.write("[]" if sep == "[\n" else "\n]")
@@ -0,0 +1,202 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+from __future__ import unicode_literals
+
+import hashlib, re
+
+from django.conf import settings
+from django.utils.cache import has_vary_header, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+from multitier.thread_locals import get_current_site
+
+from .cache import cache_get, cache_set
+from .compat import is_authenticated
+from .routers import enable_replica_reads, has_written
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses responses with brotli (when the `brotli` package is installed)
+    or gzip, whichever the client accepts.
+
+    The middleware must be listed before any middleware that reads
+    or writes the response content, such that it compresses the content
+    last, after `inject_edition_tools` rewrote it.
+
+    Responses smaller than `RESPONSE_COMPRESSION_MIN_SIZE` bytes,
+    with a content type starting with one of
+    `RESPONSE_COMPRESSION_EXCLUDED_CONTENT_TYPES`, or a path matching
+    one of `RESPONSE_COMPRESSION_EXCLUDED_PATHS`, are left untouched.
+    Compressed content of responses with a strong ETag is cached
+    for `RESPONSE_COMPRESSION_CACHE_TIMEOUT` seconds, keyed by a digest
+    of the content, unless the response is private (`Cache-Control: private`
+    or `Vary: Cookie`).
+
+    Responses that might contain secrets (a CSRF token, a response
+    to an authenticated user, or `Cache-Control: private`) are never
+    compressed with brotli, which, unlike gzip, cannot be padded with random
+    bytes to mitigate the BREACH attack.
+    """
+    # Mitigates the BREACH attack the same way
+    # `django.middleware.gzip.GZipMiddleware` does.
+    max_random_bytes = 100
+
+    @staticmethod
+    def is_cache_private(response):
+        return re.search(r'\bprivate\b', response.get('Cache-Control', ''))
+
+    def is_private(self, response):
+        return (self.is_cache_private(response) or
+            has_vary_header(response, 'Cookie'))
+
+    def has_secrets(self, request, response):
+        # `CsrfViewMiddleware` sets the CSRF cookie whenever the CSRF token
+        # was used to render the response.
+        return (self.is_cache_private(response) or
+            settings.CSRF_COOKIE_NAME in response.cookies or
+            is_authenticated(request))
+
+    def get_encoding(self, request, response):
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if (brotli and re.search(r'\bbr\b', accept_encoding) and
+            not self.has_secrets(request, response)):
+            return 'br'
+        if re.search(r'\bgzip\b', accept_encoding):
+            return 'gzip'
+        return None
+
+    @staticmethod
+    def is_excluded(request, response):
+        content_type = response.get('Content-Type', '').lower()
+        for excluded in settings.RESPONSE_COMPRESSION_EXCLUDED_CONTENT_TYPES:
+            if content_type.startswith(excluded):
+                return True
+        for excluded in settings.RESPONSE_COMPRESSION_EXCLUDED_PATHS:
+            if re.match(excluded, request.path):
+                return True
+        return False
+
+    def compress(self, content, encoding):
+        if encoding == 'br':
+            return brotli.compress(content)
+        return compress_string(content,
+            max_random_bytes=self.max_random_bytes)
+
+    def compress_streaming(self, streaming_content, encoding):
+        if encoding == 'br':
+            compressor = brotli.Compressor()
+            for chunk in streaming_content:
+                data = compressor.process(chunk)
+                if data:
+                    yield data
+            yield compressor.finish()
+        else:
+            yield from compress_sequence(streaming_content,
+                max_random_bytes=self.max_random_bytes)
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        if self.is_excluded(request, response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.get_encoding(request, response)
+        if not encoding:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                # XXX We only compress synchronous iterators.
+                return response
+            response.streaming_content = self.compress_streaming(
+                response.streaming_content, encoding)
+            # Content-Length is not known after compression.
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE:
+                return response
+            etag = response.get('ETag')
+            cache_key = None
+            compressed_content = None
+            # The content of a response is rewritten after its ETag is set
+            # (ex: `inject_edition_tools`), so we key by the content itself.
+            if (etag and etag.startswith('"') and
+                'no-store' not in response.get('Cache-Control', '') and
+                not self.is_private(response)):
+                cache_key = 'compressed:%s:%s' % (encoding,
+                    hashlib.sha256(response.content).hexdigest())
+                compressed_content = cache_get(cache_key)
+            if compressed_content is None:
+                compressed_content = self.compress(response.content, encoding)
+                if cache_key:
+                    cache_set(cache_key, compressed_content,
+                        timeout=settings.RESPONSE_COMPRESSION_CACHE_TIMEOUT)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        # The content was modified so the ETag is not strong anymore.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+class ReplicaMiddleware(MiddlewareMixin):
+    """
+    Lets `djaoapp.routers.ReplicaRouter` route reads to replicas
+    while serving GET and HEAD requests to the API, unless the client
+    (identified by its session or its `Authorization` header) wrote
+    to the database in the last `DB_REPLICA_LAG` seconds, or the `shared`
+    cache clients that wrote are recorded in is local to the process.
+    """
+    api_path_re = re.compile(r'^/api/')
+
+    @staticmethod
+    def _get_client_key(request, session_key=None):
+        client = session_key or request.COOKIES.get(
+            settings.SESSION_COOKIE_NAME) or request.META.get(
+            'HTTP_AUTHORIZATION')
+        if not client:
+            return None
+        return 'db_pinned:%s' % hashlib.sha256(
+            client.encode('utf-8')).hexdigest()
+
+    def is_replica_safe(self, request):
+        if not settings.DB_REPLICAS or request.method not in ('GET', 'HEAD'):
+            return False
+        if not settings.CACHE_SHARED_BETWEEN_PROCESSES:
+            # Other workers would not know the client wrote.
+            return False
+        path = request.path_info
+        site = get_current_site()
+        path_prefix = site.path_prefix if site else None
+        if path_prefix and path.startswith('/%s/' % path_prefix):
+            path = path[len(path_prefix) + 1:]
+        if not self.api_path_re.match(path):
+            return False
+        client_key = self._get_client_key(request)
+        return not (client_key and cache_get(client_key))
+
+    def process_request(self, request):
+        enable_replica_reads(self.is_replica_safe(request))
+
+    def process_response(self, request, response):
+        if has_written():
+            # Reads for this client go to the primary database
+            # until replicas caught up.
+            session = getattr(request, 'session', None)
+            client_key = self._get_client_key(request,
+                session_key=session.session_key if session else None)
+            if client_key:
+                cache_set(client_key, True, timeout=settings.DB_REPLICA_LAG)
+        enable_replica_reads(False)
+        return response
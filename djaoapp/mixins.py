@@ -1,24 +1,29 @@
-# Copyright (c) 2025, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 from __future__ import unicode_literals
 
-import logging
+import hashlib, logging, math
 
 from deployutils.apps.django_deployutils.compat import is_authenticated
 from django.contrib.auth import get_backends, get_user_model
 from django.db import router, transaction
+from django.http import HttpResponse, HttpResponseNotModified
 from django.template.defaultfilters import slugify
+from django.utils.http import parse_etags
+from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rules import signals as rules_signals
 from rules.utils import get_current_app
-from saas import settings as saas_settings
 from saas.helpers import update_context_urls
-from saas.models import Agreement, Organization, Plan, Signature, get_broker
+from saas.models import Agreement, Organization, Plan, Signature
 from saas.utils import get_organization_model
 from signup.models import Notification
 
+from .cache import get_version_token
 from .compat import gettext_lazy as _, reverse, six
 from .edition_tools import fail_edit_perm
+from .thread_locals import is_broker_manager
+from .throttling import consume, get_ident
 from .utils import PERSONAL_REGISTRATION, USER_REGISTRATION
 
 
@@ -226,6 +231,132 @@ class AuthMixin(object):
         return context
 
 
+class ConditionalGetMixin(object):
+    """
+    Adds an `ETag` header to GET responses, and responds 304 Not Modified
+    when the `If-None-Match` header matches, without building the response.
+
+    The ETag is derived from version tokens (see
+    `djaoapp.cache.get_version_token`) for the keys returned
+    by `get_etag_version_keys`. Tokens are bumped whenever the records
+    a response is built from are modified (see `djaoapp.signals`).
+    """
+    etag = None
+
+    def get_etag_version_keys(self):
+        #pylint:disable=no-self-use
+        return []
+
+    def get_etag(self, request):
+        keys = self.get_etag_version_keys()
+        if not keys:
+            return None
+        parts = [str(request.user.pk) if is_authenticated(request) else "",
+            request.META.get('HTTP_ACCEPT', ''), request.get_full_path()]
+        parts += [get_version_token(key) for key in keys]
+        return '"%s"' % hashlib.sha256(
+            "\n".join(parts).encode('utf-8')).hexdigest()
+
+    def get_not_modified_response(self, request):
+        """
+        Returns a 304 Not Modified response if the client already
+        has the current representation, otherwise `None`.
+        """
+        self.etag = self.get_etag(request)
+        # `djaoapp.middleware.CompressionMiddleware` turns the ETag into
+        # a weak ETag, and If-None-Match uses the weak comparison anyway.
+        if self.etag and self.etag in [
+                etag[2:] if etag.startswith('W/') else etag
+                for etag in parse_etags(
+                    request.META.get('HTTP_IF_NONE_MATCH', ''))]:
+            # We do not return a `Response` here such that renderers
+            # (ex: `DynamicMenubarItemRenderer`) are not invoked.
+            response = HttpResponseNotModified()
+            response['ETag'] = self.etag
+            return response
+        return None
+
+    def get(self, request, *args, **kwargs):
+        response = self.get_not_modified_response(request)
+        if response is not None:
+            return response
+        return super(ConditionalGetMixin, self).get(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super(ConditionalGetMixin, self).finalize_response(
+            request, response, *args, **kwargs)
+        if (self.etag and request.method in ('GET', 'HEAD') and
+            response.status_code == status.HTTP_200_OK):
+            response['ETag'] = self.etag
+        return response
+
+
+class SparseFieldsMixin(object):
+    """
+    Restricts the fields returned by a GET request to the comma-separated
+    list passed in the `fields` query parameter.
+
+    Fields that were not requested are removed from the serializer,
+    so the queries to compute them are never run. Views can also call
+    `is_field_requested` to skip loading related records.
+    """
+    fields_param = 'fields'
+
+    @property
+    def requested_fields(self):
+        """
+        Returns the set of requested field names, or `None` when
+        all fields should be returned.
+        """
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = None
+            request = getattr(self, 'request', None)
+            if request is not None and request.method in ('GET', 'HEAD'):
+                # `GET` instead of `query_params` such that it also works
+                # with the `HttpRequest` used to generate the API schema.
+                fields = request.GET.get(self.fields_param)
+                if fields:
+                    self._requested_fields = set([field.strip()
+                        for field in fields.split(',') if field.strip()])
+        return self._requested_fields
+
+    def is_field_requested(self, field_name):
+        requested_fields = self.requested_fields
+        return requested_fields is None or field_name in requested_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super(SparseFieldsMixin, self).get_serializer(
+            *args, **kwargs)
+        if self.requested_fields is not None:
+            fields = (serializer.child.fields
+                if hasattr(serializer, 'child') else serializer.fields)
+            for field_name in list(fields):
+                if not self.is_field_requested(field_name):
+                    fields.pop(field_name)
+        return serializer
+
+
+class ThrottleMixin(object):
+    """
+    Rejects POST requests with a 429 status code when the client emptied
+    its token bucket for `throttle_scope`
+    (see `djaoapp.throttling.TokenBucketThrottle` for API views).
+    """
+    throttle_scope = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.throttle_scope and request.method == 'POST':
+            wait = consume(self.throttle_scope, get_ident(request))
+            if wait:
+                response = HttpResponse(
+                    _("Too many requests. Please try again later."),
+                    content_type='text/plain',
+                    status=status.HTTP_429_TOO_MANY_REQUESTS)
+                response['Retry-After'] = str(int(math.ceil(wait)))
+                return response
+        return super(ThrottleMixin, self).dispatch(request, *args, **kwargs)
+
+
 class DjaoAppMixin(object):
     """
     Adds URL for next step in the wizard.
@@ -283,9 +414,7 @@ class NotificationsMixin(object):
             for notification_slug, notification in schema.get('paths').items()})
         # user with profile manager of broker (or theme editor), we do not
         # filter notifications.
-        broker = get_broker()
-        if user and not broker.with_role(
-                saas_settings.MANAGER).filter(pk=user.pk).exists():
+        if user and not is_broker_manager(user):
             # regular subscriber
             notifications = {key: notifications[key]
                 for key in notifications if key not in [
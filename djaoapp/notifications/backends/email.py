@@ -19,7 +19,8 @@ from signup import settings as signup_settings
 from signup.models import Contact
 
 from ...compat import gettext_lazy as _
-from ...thread_locals import build_absolute_uri
+from ...thread_locals import (build_absolute_uri, get_broker_manager_ids,
+    is_current_broker)
 from ...utils import get_email_connection, get_notified_on_errors
 from ..serializers import ExpireUserNotificationSerializer
 
@@ -28,7 +29,13 @@ LOGGER = logging.getLogger(__name__)
 
 
 def _notified_managers(organization, notification_slug, originated_by=None):
-    managers = organization.with_role(saas_settings.MANAGER)
+    if is_current_broker(organization):
+        #pylint:disable=protected-access
+        managers = get_user_model().objects.db_manager(
+            using=organization._state.db).filter(
+            pk__in=get_broker_manager_ids())
+    else:
+        managers = organization.with_role(saas_settings.MANAGER)
     if originated_by:
         managers = managers.exclude(email=originated_by.get('email', ""))
     # checking whether those users are subscribed to the notification
@@ -1,4 +1,4 @@
-# Copyright (c) 2023, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # All rights reserved.
 #
 # Redistribution and use in source and binary forms, with or without
@@ -22,18 +22,386 @@
 # OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
 # ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import hashlib, json, logging
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.core.paginator import InvalidPage
+from django.db import DatabaseError, connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import (
     PageNumberPagination as BasePageNumberPagination)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
+from .cache import cache_get, cache_set
 from .compat import gettext_lazy as _
 
+LOGGER = logging.getLogger(__name__)
+
 
 class PageNumberPagination(BasePageNumberPagination):
+    """
+    Paginates records by page numbers (`page=`), or by keyset
+    when the `cursor=` query parameter is present.
 
+    In keyset mode, the page is selected with a `WHERE` clause on the fields
+    the queryset is ordered by (i.e. as specified by the `o` query parameter)
+    instead of an `OFFSET`, so that deep pages cost the same as the first.
+    An empty `cursor=` starts at the first page, and the `next`/`previous`
+    URLs in the response carry opaque cursors for the adjacent pages.
+    `count` is the number of records in the whole list on every page.
+
+    When a queryset holds more than `PAGINATION_APPROXIMATE_COUNT_THRESHOLD`
+    records, `count` is estimated from the PostgreSQL planner statistics,
+    or cached for `PAGINATION_COUNT_CACHE_TIMEOUT` seconds on other
+    databases, instead of running a `COUNT(*)` on every call. The response
+    then includes `count_is_approximate: true`. An approximate `count` is
+    only reported; pages are validated against the records actually fetched.
+    """
     max_page_size = 100
     page_size_query_param = 'page_size'
     page_size_query_description = _("Number of results to return per page"\
     " between 1 and 100 (defaults to 25).")
+    cursor_query_param = 'cursor'
+    cursor_query_description = _("Opaque cursor returned in `next`"\
+    " or `previous` to paginate by keyset (use an empty value to start"\
+    " at the first page).")
+    invalid_cursor_message = _("Invalid cursor")
+
+    keyset = False
+    count = None
+    count_is_approximate = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = False
+        self.count_is_approximate = False
+        if self.cursor_query_param in request.query_params:
+            ordering = self.get_keyset_ordering(queryset)
+            if ordering:
+                return self.paginate_queryset_by_keyset(
+                    queryset, request, ordering)
+            # We cannot paginate on a keyset, so we fall back
+            # to page numbers.
+        return self.paginate_queryset_by_page_number(queryset, request)
+
+    def paginate_queryset_by_page_number(self, queryset, request):
+        # Implementation Note: Same as `BasePageNumberPagination`
+        # except we compute `count` through `get_count`.
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        self.count = self.get_count(queryset)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            if not self.count_is_approximate:
+                paginator.count = self.count
+                self.page = paginator.page(page_number)
+            elif page_number in self.last_page_strings:
+                self.count_is_approximate = False
+                self.count = paginator.count
+                self.page = paginator.page(page_number)
+            else:
+                self.page = self.get_page_by_fetch(paginator, page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            # The browsable API should display pagination controls.
+            self.display_page_controls = True
+
+        return list(self.page)
+
+    def get_page_by_fetch(self, paginator, page_number):
+        """
+        Returns the page *page_number* of *paginator*, validated against
+        the records fetched rather than `paginator.count` which is only
+        an approximation.
+        """
+        #pylint:disable=protected-access
+        try:
+            number = int(page_number)
+        except (TypeError, ValueError):
+            # Let the paginator raise the appropriate `InvalidPage`.
+            return paginator.page(page_number)
+        if number < 1:
+            paginator.validate_number(number)
+        offset = (number - 1) * paginator.per_page
+        records = list(
+            paginator.object_list[offset:offset + paginator.per_page + 1])
+        if len(records) > paginator.per_page:
+            # There is at least one more page.
+            paginator.count = max(self.count, offset + len(records))
+            records = records[:paginator.per_page]
+        else:
+            # This is the last page, so we know the exact count.
+            paginator.count = offset + len(records)
+            if records or number == 1:
+                self.count = paginator.count
+                self.count_is_approximate = False
+        number = paginator.validate_number(number)
+        return paginator._get_page(records, number, paginator)
+
+    def get_count(self, queryset):
+        """
+        Returns the number of records in the queryset, or an approximation
+        when the queryset is larger than
+        `PAGINATION_APPROXIMATE_COUNT_THRESHOLD`, in which case
+        `count_is_approximate` is set.
+        """
+        threshold = settings.PAGINATION_APPROXIMATE_COUNT_THRESHOLD
+        if not isinstance(queryset, QuerySet):
+            return len(queryset)
+        if threshold is None:
+            return queryset.count()
+
+        if connections[queryset.db].vendor == 'postgresql':
+            # Counting up to the threshold is cheap, and exact on small
+            # lists, for which we skip asking the planner for an estimate.
+            count = queryset[:threshold + 1].count()
+            if count <= threshold:
+                return count
+            estimate = self.get_estimated_count(queryset)
+            if estimate is not None and estimate > threshold:
+                self.count_is_approximate = True
+                return estimate
+            return queryset.count()
+
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        cache_key = 'count:%s' % hashlib.sha256(
+            ("%s:%s" % (sql, params)).encode('utf-8')).hexdigest()
+        count = cache_get(cache_key, using=queryset.db)
+        if count is not None:
+            self.count_is_approximate = True
+            return count
+        count = queryset.count()
+        if count > threshold:
+            cache_set(cache_key, count,
+                timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT,
+                using=queryset.db)
+        return count
+
+    @staticmethod
+    def get_estimated_count(queryset):
+        """
+        Returns the number of rows the PostgreSQL planner estimates
+        *queryset* will return, or `None` if no estimate could be made.
+        """
+        try:
+            sql, params = queryset.query.sql_with_params()
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute("EXPLAIN (FORMAT JSON) %s" % sql, params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        except EmptyResultSet:
+            return 0
+        except (DatabaseError, KeyError, IndexError, TypeError,
+                ValueError) as err:
+            LOGGER.warning("cannot estimate number of rows: %s", err)
+        return None
+
+    def get_keyset_ordering(self, queryset):
+        """
+        Returns the list of `(field_name, descending)` tuples the keyset
+        is made of, ending with the primary key as a tie-breaker, or `None`
+        if *queryset* cannot be paginated by keyset.
+        """
+        #pylint:disable=no-self-use,protected-access
+        if not isinstance(queryset, QuerySet):
+            return None
+        model = queryset.model
+        ordering = []
+        for term in (queryset.query.order_by or model._meta.ordering):
+            if not isinstance(term, str) or term == '?':
+                return None
+            descending = term.startswith('-')
+            field_name = term.lstrip('-+')
+            if field_name in queryset.query.annotations:
+                ordering += [(field_name, descending)]
+                continue
+            if field_name == 'pk':
+                field_name = model._meta.pk.name
+            # Ordering by a relation orders by the related model's ordering
+            # which we do not attempt to mimic.
+            field = None
+            rel_model = model
+            try:
+                for part in field_name.split('__'):
+                    field = rel_model._meta.get_field(part)
+                    rel_model = field.related_model
+            except (AttributeError, FieldDoesNotExist):
+                return None
+            if field is None or field.is_relation:
+                return None
+            ordering += [(field_name, descending)]
+        pk_name = model._meta.pk.name
+        if pk_name not in [field_name for field_name, _ in ordering]:
+            descending = ordering[-1][1] if ordering else False
+            ordering += [(pk_name, descending)]
+        return ordering
+
+    def paginate_queryset_by_keyset(self, queryset, request, ordering):
+        self.request = request
+        self.keyset = True
+        self.base_url = remove_query_param(
+            request.build_absolute_uri(), self.page_query_param)
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request, len(ordering))
+
+        self.count = self.get_count(queryset)
+        if reverse:
+            ordering = [(field_name, not descending)
+                for field_name, descending in ordering]
+        queryset = queryset.order_by(*[
+            ('-%s' % field_name) if descending else field_name
+            for field_name, descending in ordering])
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(queryset, ordering, position))
+        records = list(queryset[:page_size + 1])
+        has_more = len(records) > page_size
+        records = records[:page_size]
+
+        self.next_position = None
+        self.previous_position = None
+        if reverse:
+            records.reverse()
+            self.next_position = (self._get_position(records[-1], ordering)
+                if records else position)
+            if records and has_more:
+                self.previous_position = self._get_position(
+                    records[0], ordering)
+        else:
+            if position is not None:
+                self.previous_position = (self._get_position(
+                    records[0], ordering) if records else position)
+            if has_more:
+                self.next_position = self._get_position(records[-1], ordering)
+        return records
+
+    @staticmethod
+    def _get_position(record, ordering):
+        position = []
+        for field_name, _ in ordering:
+            if isinstance(record, dict):
+                value = record.get(field_name)
+            else:
+                value = record
+                for part in field_name.split('__'):
+                    value = getattr(value, part, None)
+            position += [value]
+        return position
+
+    @staticmethod
+    def get_keyset_filter(queryset, ordering, position):
+        """
+        Returns a ``Q`` object that selects the records after *position*
+        when *queryset* is sorted by *ordering*.
+        """
+        nulls_largest = connections[queryset.db].features.nulls_order_largest
+        keyset_filter = Q(pk__in=[])
+        equals = Q()
+        for (field_name, descending), value in zip(ordering, position):
+            greater = not descending
+            if value is None:
+                if nulls_largest != greater:
+                    keyset_filter |= (equals & Q(**{
+                        '%s__isnull' % field_name: False}))
+                equals &= Q(**{'%s__isnull' % field_name: True})
+            else:
+                after = Q(**{'%s__%s' % (
+                    field_name, 'gt' if greater else 'lt'): value})
+                if nulls_largest == greater:
+                    after |= Q(**{'%s__isnull' % field_name: True})
+                keyset_filter |= (equals & after)
+                equals &= Q(**{field_name: value})
+        return keyset_filter
+
+    def decode_cursor(self, request, nb_fields):
+        """
+        Returns the position (i.e. list of values of the keyset fields)
+        and direction encoded in the cursor.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(
+                encoded.encode('ascii') + b'=' * (-len(encoded) % 4)))
+            position = cursor['p']
+            reverse = bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != nb_fields:
+            # The ordering has changed since the cursor was generated.
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse=False):
+        """
+        Returns the URL to the page after (or before when *reverse*
+        is `True`) *position*.
+        """
+        cursor = {'p': position}
+        if reverse:
+            cursor.update({'r': 1})
+        # Values are serialized with `str` such that datetimes keep their
+        # microseconds.
+        encoded = urlsafe_b64encode(json.dumps(cursor,
+            default=str).encode('utf-8')).decode('ascii').rstrip('=')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super(PageNumberPagination, self).get_next_link()
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super(PageNumberPagination, self).get_previous_link()
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        resp_data = {
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count_is_approximate:
+            resp_data.update({'count_is_approximate': True})
+        return Response(resp_data)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super(
+            PageNumberPagination, self).get_schema_operation_parameters(view)
+        parameters += [{
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': str(self.cursor_query_description),
+            'schema': {
+                'type': 'string',
+            },
+        }]
+        return parameters
 
     def get_paginated_response_schema(self, schema):
         if 'description' not in schema:
@@ -45,6 +413,11 @@ class PageNumberPagination(BasePageNumberPagination):
                     'type': 'integer',
                     'description': "The number of records"
                 },
+                'count_is_approximate': {
+                    'type': 'boolean',
+                    'description': "Present and true when `count` is"\
+                        " an estimate rather than an exact number of records"
+                },
                 'next': {
                     'type': 'string',
                     'description': "API end point to get the next page"\
@@ -0,0 +1,46 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+JSON parser that decodes with `orjson` when it is installed.
+
+Request bodies `orjson` cannot decode, or not encoded in UTF-8,
+go through `rest_framework.parsers.JSONParser` such that error
+messages are unchanged. That is also the case of `NaN` and `Infinity`,
+which are rejected as before, and of numbers too large for a float
+(ex: `1e400`), which are still decoded as infinite floats. Exponents
+are decoded the same with or without a sign (`1e16` or `1e+16`).
+Integers larger than 64 bits are decoded as floats by `orjson`.
+"""
+from __future__ import unicode_literals
+
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser as BaseJSONParser
+
+from .renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONParser(BaseJSONParser):
+
+    renderer_class = JSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('_', '-') not in (
+                'utf-8', 'utf8'):
+            return super(JSONParser, self).parse(stream,
+                media_type=media_type, parser_context=parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super(JSONParser, self).parse(io.BytesIO(body),
+                media_type=media_type, parser_context=parser_context)
@@ -0,0 +1,137 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Permission checks memoized for the duration of a request.
+
+The memoized `fail_*` functions are referenced in `RULES['RULE_OPERATORS']`,
+which `rules.models` loads while it is imported, so this module must not
+import `rules.models`, directly or indirectly.
+"""
+from __future__ import unicode_literals
+
+import logging, threading
+from functools import wraps
+
+from saas.decorators import (fail_direct as fail_direct_default,
+    fail_provider as fail_provider_default,
+    fail_provider_only as fail_provider_only_default,
+    fail_self_provider as fail_self_provider_default)
+
+from .compat import is_authenticated
+
+LOGGER = logging.getLogger(__name__)
+
+_permissions_memos_lock = threading.Lock()
+_permissions_memos_generation = 0
+
+
+def get_permissions_memo(request):
+    """
+    Returns the memo of permission checks already performed while serving
+    *request*, creating it as necessary.
+    """
+    # `rest_framework.request.Request` forwards attribute lookups
+    # to the wrapped `HttpRequest` but not assignments, so we always store
+    # the memo on the `HttpRequest`.
+    http_request = getattr(request, '_request', request)
+    memo = getattr(http_request, '_permissions_memo', None)
+    if memo is None:
+        memo = {'results': {}, 'checks': 0, 'hits': 0,
+            'generation': _permissions_memos_generation}
+        http_request._permissions_memo = memo #pylint:disable=protected-access
+    elif memo['generation'] != _permissions_memos_generation:
+        memo['results'].clear()
+        memo['generation'] = _permissions_memos_generation
+    return memo
+
+
+def invalidate_permissions_memos():
+    """
+    Discards the permission checks memoized by the requests being served
+    in this process, since they might not hold anymore (ex: a role
+    was granted while serving one of the requests).
+    """
+    global _permissions_memos_generation #pylint:disable=global-statement
+    with _permissions_memos_lock:
+        _permissions_memos_generation += 1
+
+
+def memoize_permission(request, key, check_func):
+    """
+    Returns the result of `check_func()`, calling it only the first time
+    *key* is seen while serving *request*.
+    """
+    if request is None:
+        return check_func()
+    memo = get_permissions_memo(request)
+    memo['checks'] += 1
+    if key in memo['results']:
+        memo['hits'] += 1
+        return memo['results'][key]
+    result = check_func()
+    memo['results'][key] = result
+    return result
+
+
+def log_permissions_memo(request, view_name):
+    """
+    Logs how many duplicate permission checks were eliminated
+    while serving *request*.
+    """
+    memo = getattr(getattr(request, '_request', request),
+        '_permissions_memo', None)
+    if memo and memo['checks']:
+        LOGGER.debug("%s: %d permission checks, %d duplicates eliminated",
+            view_name, memo['checks'], memo['hits'],
+            extra={'event': 'permission-checks', 'request': request,
+                'view': view_name, 'nb_checks': memo['checks'],
+                'nb_duplicates': memo['hits']})
+
+
+def _memoized_fail(fail_func, request, **kwargs):
+    """
+    Calls *fail_func* only once per request for the same
+    (user, account, role level), unless a role was granted or revoked
+    in the meantime (see `invalidate_permissions_memos`).
+    """
+    user = request.user if is_authenticated(request) else None
+    key = (fail_func.__name__, user.pk if user else None, request.method,
+        tuple(sorted((name, str(val)) for name, val in kwargs.items())))
+    return memoize_permission(request, key,
+        lambda: fail_func(request, **kwargs))
+
+
+# Implementation Note: `rules.urldecorators` passes URL keyword arguments
+# to the functions in `redirects` based on the function argument names,
+# so we have to spell the arguments out. Upstream docstrings are kept
+# since `rules` shows their first line as the name of the rule operator
+# (see `RULE_OPERATORS`).
+@wraps(fail_direct_default, assigned=('__doc__',))
+def fail_direct(request, profile=None, roledescription=None, brokers=None,
+                **kwargs):
+    return _memoized_fail(fail_direct_default, request,
+        profile=profile, roledescription=roledescription, brokers=brokers,
+        **kwargs)
+
+
+@wraps(fail_provider_default, assigned=('__doc__',))
+def fail_provider(request, profile=None, roledescription=None, brokers=None,
+                  **kwargs):
+    return _memoized_fail(fail_provider_default, request,
+        profile=profile, roledescription=roledescription, brokers=brokers,
+        **kwargs)
+
+
+@wraps(fail_provider_only_default, assigned=('__doc__',))
+def fail_provider_only(request, profile=None, roledescription=None,
+                       brokers=None, **kwargs):
+    return _memoized_fail(fail_provider_only_default, request,
+        profile=profile, roledescription=roledescription, brokers=brokers,
+        **kwargs)
+
+
+@wraps(fail_self_provider_default, assigned=('__doc__',))
+def fail_self_provider(request, user=None, roledescription=None, **kwargs):
+    return _memoized_fail(fail_self_provider_default, request,
+        user=user, roledescription=roledescription, **kwargs)
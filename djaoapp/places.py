@@ -0,0 +1,118 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Street address auto-complete through the Google Places API.
+
+A `googlemaps.Client` keeps a `requests.Session` such that connections
+to the API are re-used. We thus create a single client per API key
+(sites can use their own key) instead of one per request.
+
+Results are cached for `GOOGLE_PLACES_CACHE_TIMEOUT` seconds, and
+identical requests made concurrently in a process are collapsed into
+a single call to the API.
+"""
+from __future__ import unicode_literals
+
+import hashlib, logging, threading
+from concurrent.futures import Future
+
+import googlemaps
+from django.conf import settings
+
+from .cache import cache_get, cache_set
+
+LOGGER = logging.getLogger(__name__)
+
+#: Errors raised by `googlemaps.Client` when the API could not serve
+#: a request.
+PLACES_ERRORS = (googlemaps.exceptions.ApiError,
+    googlemaps.exceptions.TransportError, googlemaps.exceptions.Timeout)
+
+_clients_lock = threading.Lock()
+_clients = {}
+
+_inflight_lock = threading.Lock()
+_inflight = {}
+
+
+def get_places_client(key):
+    """
+    Returns the `googlemaps.Client` for API *key*.
+    """
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = googlemaps.Client(key=key,
+                timeout=settings.GOOGLE_PLACES_TIMEOUT,
+                retry_timeout=settings.GOOGLE_PLACES_TIMEOUT,
+                base_url=settings.GOOGLE_PLACES_BASE_URL)
+            _clients[key] = client
+    return client
+
+
+def _collapse_inflight(key, func):
+    """
+    Calls *func* unless a call for *key* is already in progress
+    in another thread, in which case its result is returned instead.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _inflight[key] = future
+    if not is_leader:
+        return future.result()
+    try:
+        result = func()
+        future.set_result(result)
+        return result
+    except Exception as err:
+        future.set_exception(err)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+def _get_cached(api_key, method, arg, func):
+    cache_key = 'places:%s:%s' % (method, hashlib.sha256(
+        ("%s\n%s" % (api_key, arg)).encode('utf-8')).hexdigest())
+    result = cache_get(cache_key)
+    if result is None:
+        def fetch():
+            value = func()
+            cache_set(cache_key, value,
+                timeout=settings.GOOGLE_PLACES_CACHE_TIMEOUT)
+            return value
+        result = _collapse_inflight(cache_key, fetch)
+    return result
+
+
+def places_autocomplete(api_key, query):
+    """
+    Returns street address candidates that start with *query*.
+    """
+    query = " ".join(query.split())
+    # Keystrokes that only differ by case or whitespace share results.
+    return _get_cached(api_key, 'autocomplete', query.lower(),
+        lambda: get_places_client(api_key).places_autocomplete(
+            query, types='address'))
+
+
+def place_detail(api_key, place_id):
+    """
+    Returns the details of place *place_id*, or `None` if it does not exist.
+    """
+    def fetch():
+        try:
+            result = get_places_client(api_key).place(place_id)
+        except googlemaps.exceptions.ApiError as err:
+            if err.status in ('NOT_FOUND', 'INVALID_REQUEST', 'ZERO_RESULTS'):
+                return {}
+            raise
+        return result.get('result', {}) if result.get('status') == 'OK' else {}
+    # We cache `{}` for places that do not exist since `None` means
+    # a cache miss.
+    return _get_cached(api_key, 'detail', place_id, fetch) or None
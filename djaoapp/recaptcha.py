@@ -0,0 +1,104 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Verification of reCAPTCHA responses submitted through the API.
+
+Requests to the siteverify endpoint go through a single `requests.Session`
+such that connections are re-used, and are bounded by
+`RECAPTCHA_VERIFY_TIMEOUT` such that a slow endpoint cannot tie up
+a worker for long.
+
+`RECAPTCHA_VERIFIER` is the dotted path to the function used to verify
+responses. Load tests can set it to `djaoapp.recaptcha.stand_in_verify`
+so no request is sent to Google.
+"""
+from __future__ import unicode_literals
+
+import logging, threading
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django_recaptcha.client import RecaptchaResponse
+from django_recaptcha.constants import DEFAULT_RECAPTCHA_DOMAIN
+
+LOGGER = logging.getLogger(__name__)
+
+#: Errors raised when the siteverify endpoint could not serve a request.
+RECAPTCHA_ERRORS = (requests.RequestException, ValueError)
+
+_session_lock = threading.Lock()
+_session = None
+
+
+def get_verify_session():
+    """
+    Returns the `requests.Session` used to call the siteverify endpoint.
+    """
+    global _session #pylint:disable=global-statement
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # Retrying would only extend the time a worker is blocked.
+            adapter = requests.adapters.HTTPAdapter(
+                pool_maxsize=settings.RECAPTCHA_VERIFY_POOL_SIZE,
+                max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.proxies.update(getattr(settings, 'RECAPTCHA_PROXY', {}))
+            _session = session
+    return _session
+
+
+def get_verify_url():
+    """
+    Returns `RECAPTCHA_VERIFY_URL`, or the siteverify endpoint
+    on `RECAPTCHA_DOMAIN` (as used by django-recaptcha) when it is not set.
+    """
+    if settings.RECAPTCHA_VERIFY_URL:
+        return settings.RECAPTCHA_VERIFY_URL
+    return "https://%s/recaptcha/api/siteverify" % getattr(
+        settings, 'RECAPTCHA_DOMAIN', DEFAULT_RECAPTCHA_DOMAIN)
+
+
+def verify(recaptcha_response, private_key, remoteip=None):
+    """
+    Submits *recaptcha_response* to the siteverify endpoint and returns
+    a `RecaptchaResponse`.
+    """
+    params = {
+        'secret': private_key,
+        'response': recaptcha_response,
+    }
+    if remoteip:
+        params['remoteip'] = remoteip
+    resp = get_verify_session().post(get_verify_url(),
+        data=params, timeout=settings.RECAPTCHA_VERIFY_TIMEOUT)
+    resp.raise_for_status()
+    data = resp.json()
+    return RecaptchaResponse(
+        is_valid=data.pop('success', False),
+        error_codes=data.pop('error-codes', None),
+        action=data.pop('action', None),
+        extra_data=data)
+
+
+def stand_in_verify(recaptcha_response, private_key, remoteip=None):
+    """
+    Accepts any non-empty *recaptcha_response* without contacting Google.
+
+    This function is meant for load tests. Never use it in production.
+    """
+    #pylint:disable=unused-argument
+    if not recaptcha_response:
+        return RecaptchaResponse(is_valid=False,
+            error_codes=['missing-input-response'])
+    return RecaptchaResponse(is_valid=True, extra_data={'score': 1.0})
+
+
+def get_verifier():
+    """
+    Returns the function `RECAPTCHA_VERIFIER` points to.
+    """
+    return import_string(settings.RECAPTCHA_VERIFIER)
@@ -0,0 +1,68 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+JSON renderer that encodes with `orjson` when it is installed.
+
+The output is the same as `rest_framework.renderers.JSONRenderer`:
+datetimes are written in ISO 8601 format with a 'Z' suffix for UTC,
+and types `orjson` does not handle natively (Decimal, lazy translations,
+querysets, etc.) are passed to the `encoder_class`.
+Indentations other than 2, `COMPACT_JSON = False` or `UNICODE_JSON = False`,
+and data `orjson` refuses to encode (ex: integers larger than 64 bits,
+non-string keys) fall back to the stdlib `json` encoder.
+
+Two differences remain. First, small floats are formatted differently,
+though they decode to the same values: floats between 1e-5 and 1e-4
+are written without an exponent (`0.00001` instead of `1e-05`), and
+smaller floats without zero-padding in the exponent (`1e-7` instead
+of `1e-07`). Large exponents are written the same (`1e+16`) by the pinned
+version of `orjson`. Second, NaN and infinite floats are written as `null`
+instead of raising an error.
+
+`manage.py benchmark_json` compares the output, and the time to render
+and parse API responses, with and without `orjson`.
+"""
+from __future__ import unicode_literals
+
+from rest_framework.renderers import JSONRenderer as BaseJSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONRenderer(BaseJSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or
+            self.ensure_ascii or not self.compact):
+            return super(JSONRenderer, self).render(data,
+                accepted_media_type=accepted_media_type,
+                renderer_context=renderer_context)
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent not in (None, 2):
+            return super(JSONRenderer, self).render(data,
+                accepted_media_type=accepted_media_type,
+                renderer_context=renderer_context)
+
+        option = orjson.OPT_UTC_Z | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            ret = orjson.dumps(data,
+                default=self.encoder_class().default, option=option)
+        except orjson.JSONEncodeError:
+            return super(JSONRenderer, self).render(data,
+                accepted_media_type=accepted_media_type,
+                renderer_context=renderer_context)
+
+        # We always fully escape \u2028 and \u2029 to ensure we output JSON
+        # that is a strict javascript subset (as REST framework does).
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+                b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,172 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Routes safe API reads to read replicas of the site database.
+
+`DB_REPLICAS` maps a database alias (i.e. `default` or a site `db_name`)
+to a list of its read replicas, each either a `'host[:port]'` string
+or a dictionary of connection settings (ex: `{'HOST': ..., 'USER': ...}`).
+The connection settings of a replica are the ones of the database it
+replicates, updated with those of the replica, and registered under
+the alias `<alias>-replica<index>` the first time they are needed,
+the same way multitier registers site databases.
+
+Site databases without an entry of their own use the replica hosts of
+`default` when they are on the same server as `default`.
+
+Reads are sent to a replica only while `djaoapp.middleware.ReplicaMiddleware`
+serves a GET or HEAD request to the API, and the client did not write
+to the database in the last `DB_REPLICA_LAG` seconds. Since clients that
+wrote are recorded in the `shared` cache, replicas are only used when
+that cache is shared between processes (`CACHE_SHARED_BETWEEN_PROCESSES`).
+
+Records read from a replica have `_state.db` set to the replica alias.
+Writes and relations involving them are routed to the primary database
+instead, and `get_primary_alias` must be used wherever code derives
+a database alias from a record (ex: cache keys, see `djaoapp.cache`).
+"""
+from __future__ import unicode_literals
+
+import random, threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from multitier.routers import SiteRouter
+
+_thread_locals = threading.local() #pylint: disable=invalid-name
+
+_replica_aliases_lock = threading.Lock()
+_replica_aliases = {}
+# replica alias -> primary alias
+_primary_aliases = {}
+
+
+def enable_replica_reads(enabled=True):
+    """
+    Allows (or disallows) reads to be routed to a replica in the current
+    thread, and resets the flag recording writes.
+    """
+    _thread_locals.replica_reads = enabled
+    _thread_locals.wrote = False
+
+
+def has_written():
+    """
+    Returns `True` if a write was routed since `enable_replica_reads`
+    was last called in the current thread.
+    """
+    return getattr(_thread_locals, 'wrote', False)
+
+
+def _get_replica_settings(alias):
+    replicas = settings.DB_REPLICAS.get(alias)
+    if replicas is not None:
+        return [replica if isinstance(replica, dict)
+            else _as_host_settings(replica) for replica in replicas]
+    primary = connections.databases[alias]
+    default = connections.databases[DEFAULT_DB_ALIAS]
+    if (primary.get('HOST') != default.get('HOST') or
+        primary.get('PORT') != default.get('PORT')):
+        return []
+    # The site database is on the same server as `default`, so it is
+    # replicated along with it.
+    results = []
+    for replica in settings.DB_REPLICAS.get(DEFAULT_DB_ALIAS, []):
+        if isinstance(replica, dict):
+            replica = {key: val for key, val in replica.items()
+                if key != 'NAME'}
+        else:
+            replica = _as_host_settings(replica)
+        results += [replica]
+    return results
+
+
+def _as_host_settings(replica):
+    host, _, port = replica.partition(':')
+    if port:
+        return {'HOST': host, 'PORT': port}
+    return {'HOST': host}
+
+
+def get_replica_aliases(alias):
+    """
+    Returns the aliases of the read replicas of the database *alias*,
+    adding their connection settings to `connections.databases`
+    when necessary.
+    """
+    with _replica_aliases_lock:
+        replica_aliases = _replica_aliases.get(alias)
+        if replica_aliases is None:
+            replica_aliases = []
+            for idx, replica in enumerate(_get_replica_settings(alias)):
+                replica_alias = '%s-replica%d' % (alias, idx)
+                if replica_alias not in connections.databases:
+                    replica_settings = connections.databases[alias].copy()
+                    replica_settings.update(replica)
+                    connections.databases[replica_alias] = replica_settings
+                _primary_aliases[replica_alias] = alias
+                replica_aliases += [replica_alias]
+            _replica_aliases[alias] = replica_aliases
+    return replica_aliases
+
+
+def get_primary_alias(alias):
+    """
+    Returns the alias of the database *alias* replicates, or *alias*
+    when it is not a replica.
+    """
+    with _replica_aliases_lock:
+        return _primary_aliases.get(alias, alias)
+
+
+def _get_instance_primary_alias(hints):
+    instance = hints.get('instance')
+    #pylint:disable=protected-access
+    alias = instance._state.db if instance is not None else None
+    if alias:
+        primary = get_primary_alias(alias)
+        if primary != alias:
+            return primary
+    return None
+
+
+class ReplicaRouter(SiteRouter):
+    """
+    Same as `SiteRouter` except reads are routed to a replica
+    when it is safe to do so.
+    """
+    def db_for_read(self, model, **hints):
+        primary = super(ReplicaRouter, self).db_for_read(model, **hints)
+        if primary is None:
+            # Django would otherwise read related records from the replica
+            # the *instance* hint was read from.
+            primary = _get_instance_primary_alias(hints)
+        if not getattr(_thread_locals, 'replica_reads', False):
+            return primary
+        alias = primary or DEFAULT_DB_ALIAS
+        if connections[alias].in_atomic_block:
+            return primary
+        replicas = get_replica_aliases(alias)
+        if not replicas:
+            return primary
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Once a write occurred, subsequent reads in the same request
+        # must see it.
+        _thread_locals.replica_reads = False
+        _thread_locals.wrote = True
+        primary = super(ReplicaRouter, self).db_for_write(model, **hints)
+        if primary is None:
+            # Django would otherwise write an *instance* read from a replica
+            # back to that replica.
+            primary = _get_instance_primary_alias(hints)
+        return primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        #pylint:disable=protected-access
+        if (get_primary_alias(obj1._state.db) ==
+            get_primary_alias(obj2._state.db)):
+            return True
+        return super(ReplicaRouter, self).allow_relation(obj1, obj2, **hints)
@@ -0,0 +1,54 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Session engine that caches sessions in front of the site database.
+
+Sessions are written through to the database and the cache, and read
+from the cache when present (see `django.contrib.sessions.backends.cached_db`).
+Since sessions are stored in the site database, cache keys are prefixed
+by database, such that a session cookie sent to a site that shares the same
+domain (i.e. sites differentiated by path prefix) is never looked up
+in the sessions of a site with a different database.
+
+Sessions that hold temporary credentials (see `CREDENTIALS_SESSION_KEYS`)
+are never written to the cache, only to the database.
+
+This engine is only used when the `shared` cache is shared between processes
+(see `CACHE_SHARED_BETWEEN_PROCESSES` in settings.py). Otherwise a session
+deleted by one worker (ex: on logout) would still be served from the cache
+of another worker.
+"""
+from __future__ import unicode_literals
+
+from django.contrib.sessions.backends.cached_db import (
+    KEY_PREFIX, SessionStore as CachedDBSessionStore)
+
+from .cache import get_db_cache_key
+
+#: Session keys under which `signup.backends.sts_credentials` stores
+#: temporary AWS credentials.
+CREDENTIALS_SESSION_KEYS = ('access_key', 'secret_key', 'security_token')
+
+
+def _has_credentials(session_data):
+    return any(key in session_data for key in CREDENTIALS_SESSION_KEYS)
+
+
+class SessionStore(CachedDBSessionStore):
+
+    @property
+    def cache_key_prefix(self):
+        return get_db_cache_key(KEY_PREFIX)
+
+    def load(self):
+        data = super(SessionStore, self).load()
+        if _has_credentials(data):
+            # Loaded from the database, and cached, by the parent class.
+            self._cache.delete(self.cache_key)
+        return data
+
+    def save(self, must_create=False):
+        super(SessionStore, self).save(must_create=must_create)
+        if _has_credentials(self._session):
+            self._cache.delete(self.cache_key)
@@ -40,6 +40,45 @@ DB_HOST = ''
 DB_PORT = 5432
 DB_USER = None
 DB_PASSWORD = None
+#: Number of seconds a connection to a database is kept open
+#: for subsequent requests.
+DB_CONN_MAX_AGE = 300
+#: Maximum number of connections to (tenant) databases a worker keeps open.
+DB_MAX_CONNECTIONS = 10
+#: Maps a database alias to its read replicas, each either 'host[:port]'
+#: or a dictionary of connection settings that override the settings
+#: of the database replicated (see `djaoapp.routers`). Site databases
+#: on the same server as 'default' use the replicas of 'default'.
+#: Replicas are only used when `CACHE_SHARED_BETWEEN_PROCESSES` is `True`.
+DB_REPLICAS = {}
+#: Number of seconds reads stick to the primary database after a client
+#: wrote to it.
+DB_REPLICA_LAG = 5
+
+# Defaults for cache settings
+# ---------------------------
+#: Backend for the cache shared between processes (ex: memcached, redis).
+#: The local-memory cache is a stand-in for development and tests.
+CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+CACHE_LOCATION = ''
+#: `True` when the `shared` cache is shared between processes and its `add`
+#: is atomic. Locks, claims, throttles and sessions stored in the `shared`
+#: cache only hold across workers in that case. Derived from `CACHE_BACKEND`
+#: (memcached or redis) when not set.
+CACHE_SHARED_BETWEEN_PROCESSES = None
+#: Number of seconds values are kept in the per-process cache.
+CACHE_L1_TIMEOUT = 5
+CACHE_L1_MAX_ENTRIES = 1000
+#: Number of seconds ETag version tokens are kept (see
+#: `djaoapp.cache.get_version_token`). This bounds how long a response stays
+#: "not modified" after a change no signal tracks (ex: `QuerySet.update()`).
+CACHE_VERSION_TOKEN_TIMEOUT = 3600
+#: Directory where the API documentation is generated, once
+#: per `APP_VERSION`, by `manage.py generate_api_docs` (see
+#: `djaoapp.api_docs.views.APIDocView`), and the manifest
+#: of `generate_api_examples` is written.
+API_DOCS_ARTIFACT_DIR = os.path.join(
+    sys.prefix, 'var', 'cache', APP_NAME, 'api-docs')
 
 # XXX djaodjin-saas==0.12.0 requires this
 SAAS_ORGANIZATION_MODEL = 'saas.Organization'
@@ -54,6 +93,27 @@ UPGRADE_INSECURE_REQUESTS_IN_ASSETS = False
 RULES_ENC_KEY_OVERRIDE = None
 RULES_ENTRY_POINT_OVERRIDE = None
 REQUESTS_TIMEOUT = 120
+#: Number of seconds to wait to connect to the upstream application
+#: a request is forwarded to (`REQUESTS_TIMEOUT` bounds reading).
+PROXY_CONNECT_TIMEOUT = 5
+#: Maximum number of idle connections a worker keeps open to each
+#: upstream application.
+PROXY_POOL_SIZE = 10
+#: Number of seconds after which connections to an upstream application
+#: that is not used are closed. This should be less than the keep-alive
+#: timeout of the upstream.
+PROXY_POOL_IDLE_TIMEOUT = 5
+#: Responses from upstream applications are streamed to the client
+#: unless their content type starts with one of these, in which case
+#: they are buffered such that the edition tools can be injected.
+PROXY_BUFFERED_CONTENT_TYPES = ('text/html',)
+#: Size (in bytes) of the chunks a streamed response is copied by.
+PROXY_STREAM_CHUNK_SIZE = 64 * 1024
+#: Number of seconds an invoice key passed to an upstream application
+#: is left out of forwarded sessions while it waits to be cleared.
+#: Keys are claimed in the 'shared' cache, which must be shared between
+#: processes for a key to be cleared only once across workers.
+INVOICE_KEYS_CLAIM_TIMEOUT = 600
 
 #: Root URL root when it cannot be infered from the HTTP request,
 #: or there is no HTTP request in the context of `build_absolute_uri`.
@@ -81,8 +141,17 @@ VERIFICATION_LIFETIME = datetime.timedelta(hours=1)
 # Bots prevention
 CONTACT_DYNAMIC_VALIDATOR = None
 SIGNUP_EMAIL_DYNAMIC_VALIDATOR = None
+#: Token buckets limiting requests per client IP address to expensive
+#: endpoints, as `'<burst>/<period>'` (see `djaoapp.throttling`).
+#: Set a scope to `None` to disable throttling it.
+THROTTLE_RATES = {
+    'contact': '5/min',
+    'login': '20/min',
+    'register': '10/min',
+}
 
 DYNAMIC_MENUBAR_ITEM_CUT_OFF = 3
+RECENT_ACTIVITY_CUT_OFF = 10
 
 # Defaults for captcha workflows
 REGISTRATION_REQUIRES_RECAPTCHA = settings_lazy(
@@ -93,6 +162,19 @@ CONTACT_REQUIRES_RECAPTCHA = settings_lazy(
 # if those two settings are not of type `str`.
 RECAPTCHA_PUBLIC_KEY = 'multitier.thread_locals.get_recaptcha_pub_key'
 RECAPTCHA_PRIVATE_KEY = 'multitier.thread_locals.get_recaptcha_priv_key'
+#: Endpoint reCAPTCHA responses submitted through the API are verified
+#: against (ex: a local stand-in while load testing). Defaults
+#: to the siteverify endpoint on `RECAPTCHA_DOMAIN`.
+RECAPTCHA_VERIFY_URL = None
+#: Number of seconds to wait to connect to, then for a response from,
+#: the verify endpoint.
+RECAPTCHA_VERIFY_TIMEOUT = (2, 3)
+#: Maximum number of connections kept open to the verify endpoint.
+RECAPTCHA_VERIFY_POOL_SIZE = 10
+#: Function called to verify reCAPTCHA responses submitted through the API.
+RECAPTCHA_VERIFIER = 'djaoapp.recaptcha.verify'
+# Timeout used by django-recaptcha to verify responses submitted in forms.
+RECAPTCHA_VERIFY_REQUEST_TIMEOUT = 5
 
 # Defaults for social auth configuration
 USE_X_FORWARDED_PORT = True
@@ -116,6 +198,12 @@ SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET = settings_lazy(
 # Defaults for street address auto-complete (Google Places)
 GOOGLE_API_KEY = settings_lazy(
     'multitier.thread_locals.get_google_api_key')
+#: Root URL for the Places API (ex: a local stand-in while testing).
+GOOGLE_PLACES_BASE_URL = "https://maps.googleapis.com"
+#: Number of seconds to wait for the Places API, including retries.
+GOOGLE_PLACES_TIMEOUT = 5
+#: Number of seconds candidates and place details are cached.
+GOOGLE_PLACES_CACHE_TIMEOUT = 3600
 
 # Defaults for payment processor settings
 # ---------------------------------------
@@ -297,9 +385,15 @@ if FEATURES_DEBUG:
     )
 
 MIDDLEWARE += (
+    # Compresses the response after all other middlewares and view
+    # decorators (ex: `inject_edition_tools`) are done with its content.
+    'djaoapp.middleware.CompressionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'multitier.middleware.SiteMiddleware',
     'multitier.middleware.SetRemoteAddrFromForwardedFor',
+    # Must be before the session middleware such that writes to the session
+    # are recorded in `process_response`.
+    'djaoapp.middleware.ReplicaMiddleware',
     'rules.middleware.RulesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -332,6 +426,8 @@ DATABASES = {
         'PASSWORD': DB_PASSWORD,         # Not used with sqlite3.
         'HOST': DB_HOST,                 # Not used with sqlite3.
         'PORT': DB_PORT,                 # Not used with sqlite3.
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
         'TEST': {
             'NAME': None,
         }
@@ -341,6 +437,8 @@ DATABASES = {
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 DATABASE_ROUTERS = ('multitier.routers.SiteRouter',)
+if DB_REPLICAS:
+    DATABASE_ROUTERS = ('djaoapp.routers.ReplicaRouter',)
 
 if os.getenv('MULTITIER_DB_NAME'):
     MULTITIER_DB_NAME = os.getenv('MULTITIER_DB_NAME')
@@ -353,8 +451,52 @@ if os.getenv('MULTITIER_DB_NAME'):
                 'PASSWORD': DB_PASSWORD,         # Not used with sqlite3.
                 'HOST': DB_HOST,                 # Not used with sqlite3.
                 'PORT': DB_PORT,                 # Not used with sqlite3.
+                'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+                'CONN_HEALTH_CHECKS': True,
                 }})
 
+# Responses smaller than this number of bytes are sent uncompressed.
+RESPONSE_COMPRESSION_MIN_SIZE = 1024
+RESPONSE_COMPRESSION_EXCLUDED_PATHS = tuple([])
+RESPONSE_COMPRESSION_EXCLUDED_CONTENT_TYPES = ('image/', 'video/', 'audio/',
+    'font/woff', 'application/gzip', 'application/octet-stream',
+    'application/pdf', 'application/zip')
+RESPONSE_COMPRESSION_CACHE_TIMEOUT = 300
+
+# Cache settings
+# --------------
+if CACHE_SHARED_BETWEEN_PROCESSES is None:
+    CACHE_SHARED_BETWEEN_PROCESSES = CACHE_BACKEND.startswith((
+        'django.core.cache.backends.memcached.',
+        'django.core.cache.backends.redis.',
+        'django_redis.'))
+if not CACHE_SHARED_BETWEEN_PROCESSES and not DEBUG:
+    sys.stderr.write("warning: CACHE_BACKEND '%s' is not shared between"\
+        " processes. Locks, claims, throttles and pinned database reads"\
+        " only hold within a single worker.\n" % CACHE_BACKEND)
+
+# The local-memory cache of each process sits in front of the shared cache.
+# Keys are further prefixed by site or database in `djaoapp.cache`.
+CACHES = {
+    'default': {
+        'BACKEND': 'djaoapp.cache.TieredCache',
+        'LOCATION': APP_NAME,
+        'KEY_PREFIX': APP_NAME,
+        'VERSION': APP_VERSION,
+        'OPTIONS': {
+            'L2': 'shared',
+            'L1_TIMEOUT': CACHE_L1_TIMEOUT,
+            'L1_MAX_ENTRIES': CACHE_L1_MAX_ENTRIES,
+        }
+    },
+    'shared': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': CACHE_LOCATION,
+        'KEY_PREFIX': APP_NAME,
+        'VERSION': APP_VERSION,
+    },
+}
+
 MESSAGE_TAGS = {
     messages.ERROR: 'danger'
 }
@@ -730,6 +872,16 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PAGINATION_CLASS':
         'djaoapp.pagination.PageNumberPagination',
+    # The JSON renderer and parser use `orjson` when it is installed.
+    'DEFAULT_PARSER_CLASSES': (
+        'djaoapp.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'djaoapp.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'djaoapp.api_docs.schemas.AutoSchema',
     'EXCEPTION_HANDLER': 'djaoapp.views.errors.drf_exception_handler',
     'NON_FIELD_ERRORS_KEY': 'detail',
@@ -738,6 +890,14 @@ REST_FRAMEWORK = {
     'SEARCH_PARAM': 'q',
 }
 
+# Lists with more records than the threshold return an approximate `count`
+# (`None` to always count records exactly).
+PAGINATION_APPROXIMATE_COUNT_THRESHOLD = 10000
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+# Maximum number of profiles that can be retrieved in a single request
+# to the batch lookup API.
+PROFILE_BATCH_MAX_SLUGS = 100
+
 SPECTACULAR_SETTINGS = {
     'ENUM_GENERATE_CHOICE_DESCRIPTION': False,
     'AUTHENTICATION_WHITELIST': []
@@ -748,7 +908,7 @@ if not DEBUG:
     # for `rest_framework.renderers.BrowsableAPIRenderer`.
     REST_FRAMEWORK.update({
         'DEFAULT_RENDERER_CLASSES': (
-            'rest_framework.renderers.JSONRenderer',
+            'djaoapp.renderers.JSONRenderer',
         )
     })
 
@@ -757,6 +917,15 @@ if not DEBUG:
 # The default session serializer switched to JSONSerializer in Django 1.6
 # but just to be sure:
 SESSION_SERIALIZER = 'django.contrib.sessions.serializers.JSONSerializer'
+# Sessions are cached in front of the database only when the shared cache
+# is shared between processes. We use the shared cache directly such that
+# a session deleted by one process (ex: on logout) is not still served
+# from the local-memory cache of another.
+if CACHE_SHARED_BETWEEN_PROCESSES:
+    SESSION_ENGINE = 'djaoapp.sessions'
+    SESSION_CACHE_ALIAS = 'shared'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 
 DEBUG_TOOLBAR_PATCH_SETTINGS = False
 DEBUG_TOOLBAR_CONFIG = {
@@ -886,16 +1055,16 @@ RULES = {
         '',                                            # 0
         'saas.decorators.fail_authenticated',          # 1
         'saas.decorators.fail_agreement',              # 2
-        'saas.decorators.fail_direct',                 # 3
+        'djaoapp.perms.fail_direct',                   # 3
         'saas.decorators.fail_direct_weak',            # 4
         'saas.decorators.fail_direct_strong',          # 5
-        'saas.decorators.fail_provider',               # 6
+        'djaoapp.perms.fail_provider',                 # 6
         'saas.decorators.fail_provider_weak',          # 7
         'saas.decorators.fail_provider_strong',        # 8
-        'saas.decorators.fail_provider_only',          # 9
+        'djaoapp.perms.fail_provider_only',            # 9
         'saas.decorators.fail_provider_only_weak',     # 10
         'saas.decorators.fail_provider_only_strong',   # 11
-        'saas.decorators.fail_self_provider',          # 12
+        'djaoapp.perms.fail_self_provider',            # 12
         'saas.decorators.fail_self_provider_weak',     # 13
         'saas.decorators.fail_self_provider_strong',   # 14
         'saas.decorators.fail_paid_subscription',      # 15
@@ -1,10 +1,186 @@
-# Copyright (c) 2023, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 from __future__ import unicode_literals
 
-from django.dispatch import Signal
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from rules.models import Rule
+from saas.models import Plan, RoleDescription, Subscription
+from saas.signals import charge_updated
+from saas.utils import get_organization_model, get_role_model
+from signup.models import Activity, Contact, OTPGenerator
+
+from .activities import record_charge_updated, record_user_logged_in
+from .cache import bump_version_token
+from .connections import connection_opened, release_connections
+from .invoice_keys import flush_invoice_keys
+from .perms import invalidate_permissions_memos
+from .thread_locals import invalidate_broker_manager_ids
+from .utils import invalidate_plan_rules_index
 
 
 user_contact = Signal( #pylint:disable=invalid-name
 #    providing_args=["provider", "user", "reason"]
 )
+
+
+# We insure the method is only bounded once no matter how many times
+# this module is loaded by using a dispatch_uid as advised here:
+#   https://docs.djangoproject.com/en/dev/topics/signals/
+@receiver(user_logged_in, dispatch_uid="user_logged_in_recent_activity")
+def user_logged_in_recent_activity(sender, request, user, **kwargs):
+    #pylint:disable=unused-argument
+    record_user_logged_in(user)
+
+
+@receiver(charge_updated, dispatch_uid="charge_updated_recent_activity")
+def charge_updated_recent_activity(sender, charge, user, **kwargs):
+    #pylint:disable=unused-argument
+    record_charge_updated(charge)
+
+
+@receiver(post_save, sender=get_role_model(),
+    dispatch_uid="role_post_save_broker_managers")
+def role_post_save_broker_managers(sender, instance, **kwargs):
+    #pylint:disable=unused-argument
+    invalidate_broker_manager_ids(instance)
+
+
+@receiver(post_delete, sender=get_role_model(),
+    dispatch_uid="role_post_delete_broker_managers")
+def role_post_delete_broker_managers(sender, instance, **kwargs):
+    #pylint:disable=unused-argument
+    invalidate_broker_manager_ids(instance)
+
+
+@receiver(post_save, sender=get_role_model(),
+    dispatch_uid="role_post_save_permissions_memos")
+@receiver(post_delete, sender=get_role_model(),
+    dispatch_uid="role_post_delete_permissions_memos")
+def role_changed_permissions_memos(sender, instance, **kwargs):
+    #pylint:disable=unused-argument
+    invalidate_permissions_memos()
+
+
+@receiver(post_save, sender=Rule, dispatch_uid="rule_post_save_plan_rules")
+def rule_post_save_plan_rules(sender, instance, **kwargs):
+    #pylint:disable=unused-argument
+    invalidate_plan_rules_index(instance)
+
+
+@receiver(post_delete, sender=Rule, dispatch_uid="rule_post_delete_plan_rules")
+def rule_post_delete_plan_rules(sender, instance, **kwargs):
+    #pylint:disable=unused-argument
+    invalidate_plan_rules_index(instance)
+
+
+@receiver(connection_created, dispatch_uid="connection_created_pool")
+def connection_created_pool(sender, connection, **kwargs):
+    #pylint:disable=unused-argument
+    connection_opened(connection)
+
+
+@receiver(request_finished, dispatch_uid="request_finished_invoice_keys")
+def request_finished_invoice_keys(sender, **kwargs):
+    #pylint:disable=unused-argument
+    flush_invoice_keys()
+
+
+@receiver(request_finished, dispatch_uid="request_finished_pool")
+def request_finished_pool(sender, **kwargs):
+    #pylint:disable=unused-argument
+    release_connections()
+
+
+# Version tokens used to compute ETags on API responses
+# (see `djaoapp.mixins.ConditionalGetMixin`).
+def _bump_related_version_token(prefix, instance, field_name, slug_field):
+    #pylint:disable=protected-access
+    if not getattr(instance, '%s_id' % field_name):
+        return
+    try:
+        related = getattr(instance, field_name)
+    except ObjectDoesNotExist:
+        # The related record was deleted at the same time (i.e. cascade)
+        # and will bump its own token.
+        return
+    bump_version_token('%s:%s' % (prefix, getattr(related, slug_field)),
+        using=instance._state.db)
+
+
+@receiver(post_save, sender=get_organization_model(),
+    dispatch_uid="organization_post_save_etag")
+@receiver(post_delete, sender=get_organization_model(),
+    dispatch_uid="organization_post_delete_etag")
+def organization_changed_etag(sender, instance, **kwargs):
+    #pylint:disable=unused-argument,protected-access
+    bump_version_token('profile:%s' % instance.slug, using=instance._state.db)
+    bump_version_token('profiles', using=instance._state.db)
+
+
+@receiver(post_save, sender=Subscription,
+    dispatch_uid="subscription_post_save_etag")
+@receiver(post_delete, sender=Subscription,
+    dispatch_uid="subscription_post_delete_etag")
+def subscription_changed_etag(sender, instance, **kwargs):
+    #pylint:disable=unused-argument
+    _bump_related_version_token('profile', instance, 'organization', 'slug')
+
+
+@receiver(post_save, sender=Plan, dispatch_uid="plan_post_save_etag")
+@receiver(post_delete, sender=Plan, dispatch_uid="plan_post_delete_etag")
+def plan_changed_etag(sender, instance, **kwargs):
+    #pylint:disable=unused-argument,protected-access
+    bump_version_token('plans', using=instance._state.db)
+
+
+@receiver(post_save, sender=Activity, dispatch_uid="activity_post_save_etag")
+@receiver(post_delete, sender=Activity,
+    dispatch_uid="activity_post_delete_etag")
+def activity_changed_etag(sender, instance, **kwargs):
+    #pylint:disable=unused-argument
+    _bump_related_version_token('profile', instance, 'account', 'slug')
+
+
+@receiver(post_save, sender=get_user_model(),
+    dispatch_uid="user_post_save_etag")
+@receiver(post_delete, sender=get_user_model(),
+    dispatch_uid="user_post_delete_etag")
+def user_changed_etag(sender, instance, **kwargs):
+    #pylint:disable=unused-argument,protected-access
+    bump_version_token('user:%s' % instance.username,
+        using=instance._state.db)
+
+
+@receiver(post_save, sender=Contact, dispatch_uid="contact_post_save_etag")
+@receiver(post_delete, sender=Contact, dispatch_uid="contact_post_delete_etag")
+@receiver(post_save, sender=OTPGenerator,
+    dispatch_uid="otp_generator_post_save_etag")
+@receiver(post_delete, sender=OTPGenerator,
+    dispatch_uid="otp_generator_post_delete_etag")
+def user_contact_changed_etag(sender, instance, **kwargs):
+    #pylint:disable=unused-argument
+    _bump_related_version_token('user', instance, 'user', 'username')
+
+
+@receiver(post_save, sender=get_role_model(),
+    dispatch_uid="role_post_save_etag")
+@receiver(post_delete, sender=get_role_model(),
+    dispatch_uid="role_post_delete_etag")
+def role_changed_etag(sender, instance, **kwargs):
+    #pylint:disable=unused-argument
+    _bump_related_version_token('roles', instance, 'user', 'username')
+
+
+@receiver(post_save, sender=RoleDescription,
+    dispatch_uid="role_description_post_save_etag")
+@receiver(post_delete, sender=RoleDescription,
+    dispatch_uid="role_description_post_delete_etag")
+def role_description_changed_etag(sender, instance, **kwargs):
+    #pylint:disable=unused-argument,protected-access
+    bump_version_token('role_descriptions', using=instance._state.db)
@@ -1,4 +1,4 @@
-# Copyright (c) 2025, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 
 from deployutils.apps.django_deployutils.compat import (
@@ -171,7 +171,7 @@ def request_body_parameters(api_endpoint, defs):
         api_endpoint['requestBody']['content']['application/json']['schema']
     if '$ref' in schema:
         key = schema['$ref'].split('/')[-1]
-        schema = defs[(key, 'schemas')].schema
+        schema = defs[key]
     if 'properties' in schema:
         for prop_name, prop in schema['properties'].items():
             if ('required' not in prop and
@@ -181,7 +181,7 @@ def request_body_parameters(api_endpoint, defs):
                 first_enum = prop.get('allOf',[{}])[0]
                 if '$ref' in first_enum:
                     key = first_enum['$ref'].split('/')[-1]
-                    prop.update(defs[(key, 'schemas')].schema)
+                    prop.update(defs[key])
             prop.update({'name': prop_name})
             if 'type' not in prop and 'enum' in prop:
                 prop.update({'type': "String"}) # XXX Country enum
@@ -202,7 +202,7 @@ def responses_parameters(api_endpoint, defs):
             schema = param['content']['application/json']['schema']
             if '$ref' in schema:
                 key = schema['$ref'].split('/')[-1]
-                schema = defs[(key, 'schemas')].schema
+                schema = defs[key]
             if 'properties' in schema:
                 for prop_name, prop in schema['properties'].items():
                     if prop.get('writeOnly') and func == 'get':
@@ -213,7 +213,7 @@ def responses_parameters(api_endpoint, defs):
                         first_enum = prop.get('allOf',[{}])[0]
                         if '$ref' in first_enum:
                             key = first_enum['$ref'].split('/')[-1]
-                            prop.update(defs[(key, 'schemas')].schema)
+                            prop.update(defs[key])
                     prop.update({'name': prop_name})
                     if 'type' not in prop and 'enum' in prop:
                         prop.update({'type': "String"}) # XXX Country enum
@@ -228,7 +228,7 @@ def schema_properties(schema, defs):
         schema = schema.get('items', {})
     if '$ref' in schema:
         key = schema['$ref'].split('/')[-1]
-        schema = defs[(key, 'schemas')].schema
+        schema = defs[key]
     if 'properties' in schema:
         for prop_name, prop in schema['properties'].items():
             try:
@@ -242,7 +242,7 @@ def schema_properties(schema, defs):
                 first_enum = prop.get('allOf',[{}])[0]
                 if '$ref' in first_enum:
                     key = first_enum['$ref'].split('/')[-1]
-                    prop.update(defs[(key, 'schemas')].schema)
+                    prop.update(defs[key])
             prop.update({'name': prop_name})
             if 'type' not in prop and 'enum' in prop:
                 prop.update({'type': "String"}) # XXX Country enum
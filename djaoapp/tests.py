@@ -0,0 +1,104 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+import os, shutil, tempfile
+
+from django.contrib.auth.models import Group
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.test import TransactionTestCase, override_settings
+from saas.models import Organization
+
+from . import routers
+
+
+class ReplicaRouterTest(TransactionTestCase):
+    """
+    Routes reads to a replica, using two local SQLite databases
+    as stand-ins for the primary and its replica.
+    """
+    databases = {DEFAULT_DB_ALIAS}
+    replica_alias = '%s-replica0' % DEFAULT_DB_ALIAS
+
+    @classmethod
+    def setUpClass(cls):
+        cls.replica_dir = tempfile.mkdtemp()
+        cls.settings_override = override_settings(
+            DATABASE_ROUTERS=('djaoapp.routers.ReplicaRouter',),
+            DB_REPLICAS={DEFAULT_DB_ALIAS: [{
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': os.path.join(cls.replica_dir, 'replica.sqlite')}]})
+        cls.settings_override.enable()
+        cls._reset_replica_aliases()
+        # The replica stand-in is not a test database, and only has
+        # the tables the tests read. Its alias is registered on first use,
+        # so it cannot be listed in `databases` before then.
+        routers.get_replica_aliases(DEFAULT_DB_ALIAS)
+        cls.databases = {DEFAULT_DB_ALIAS, cls.replica_alias}
+        super(ReplicaRouterTest, cls).setUpClass()
+        with connections[cls.replica_alias].schema_editor() as editor:
+            editor.create_model(Group)
+
+    @classmethod
+    def tearDownClass(cls):
+        super(ReplicaRouterTest, cls).tearDownClass()
+        connections[cls.replica_alias].close()
+        cls._reset_replica_aliases()
+        cls.settings_override.disable()
+        shutil.rmtree(cls.replica_dir)
+
+    @classmethod
+    def _reset_replica_aliases(cls):
+        #pylint:disable=protected-access
+        with routers._replica_aliases_lock:
+            routers._replica_aliases.clear()
+            routers._primary_aliases.clear()
+        connections.databases.pop(cls.replica_alias, None)
+
+    def setUp(self):
+        Group.objects.using(DEFAULT_DB_ALIAS).create(name="On Primary")
+        Group.objects.using(self.replica_alias).create(name="On Replica")
+
+    def tearDown(self):
+        #pylint:disable=protected-access
+        routers.enable_replica_reads(False)
+        # The replica is not flushed since `auth` tables are not migrated
+        # outside of `default` (see `SiteRouter.allow_migrate`).
+        with connections[self.replica_alias].cursor() as cursor:
+            cursor.execute("DELETE FROM %s" % Group._meta.db_table)
+
+    def test_reads_from_primary_by_default(self):
+        self.assertEqual(router.db_for_read(Organization), DEFAULT_DB_ALIAS)
+        self.assertEqual([group.name for group in Group.objects.all()],
+            ["On Primary"])
+
+    def test_reads_from_replica(self):
+        routers.enable_replica_reads()
+        self.assertEqual(router.db_for_read(Organization), self.replica_alias)
+        self.assertEqual([group.name for group in Group.objects.all()],
+            ["On Replica"])
+
+    def test_reads_from_primary_after_write(self):
+        routers.enable_replica_reads()
+        Group.objects.create(name="Written")
+        self.assertTrue(routers.has_written())
+        self.assertEqual(
+            sorted([group.name for group in Group.objects.all()]),
+            ["On Primary", "Written"])
+
+    def test_writes_records_read_from_replica_to_primary(self):
+        #pylint:disable=protected-access
+        group = Group.objects.using(self.replica_alias).get()
+        self.assertEqual(group._state.db, self.replica_alias)
+        self.assertEqual(routers.get_primary_alias(group._state.db),
+            DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_write(Group, instance=group),
+            DEFAULT_DB_ALIAS)
+        self.assertTrue(router.allow_relation(group,
+            Group.objects.using(DEFAULT_DB_ALIAS).get()))
+        group.name = "Updated"
+        group.save()
+        self.assertEqual(
+            Group.objects.using(DEFAULT_DB_ALIAS).get(pk=group.pk).name,
+            "Updated")
+        self.assertEqual(
+            Group.objects.using(self.replica_alias).get().name, "On Replica")
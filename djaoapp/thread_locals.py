@@ -4,7 +4,8 @@
 import logging, os
 
 from django.conf import settings
-from django.db import DEFAULT_DB_ALIAS
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
 from django.db.models import Q
 from django.http import Http404
 from extended_templates.utils import get_default_storage_base
@@ -13,8 +14,9 @@ from multitier.mixins import build_absolute_uri as build_absolute_uri_base
 from multitier.utils import get_site_model
 from rules.utils import get_app_model, get_current_app
 from saas import settings as saas_settings
-from saas.utils import get_organization_model
+from saas.utils import get_organization_model, get_role_model
 
+from .cache import get_db_alias, get_db_cache_key
 from .compat import import_string, reverse, urljoin
 
 
@@ -127,6 +129,51 @@ def get_current_broker():
     return broker
 
 
+def _get_broker_managers_key(db_alias, broker_id):
+    return get_db_cache_key('broker_managers:%s' % broker_id, using=db_alias)
+
+
+def get_broker_manager_ids():
+    """
+    Returns the set of primary keys for users with a manager role
+    on the broker.
+
+    The set is cached per database and invalidated when a role is created,
+    updated or deleted (see `djaoapp.signals`). Since it grants
+    permissions, it is kept in the `shared` cache only, such that
+    a revoked manager is not authorized by the per-process cache
+    of another worker.
+    """
+    broker = get_current_broker()
+    #pylint:disable=protected-access
+    cache_key = _get_broker_managers_key(broker._state.db, broker.pk)
+    manager_ids = caches['shared'].get(cache_key)
+    if manager_ids is None:
+        manager_ids = set(broker.get_roles(saas_settings.MANAGER).values_list(
+            'user_id', flat=True))
+        caches['shared'].set(cache_key, manager_ids)
+    return manager_ids
+
+
+def is_broker_manager(user):
+    """
+    Returns `True` if *user* has a manager role on the broker.
+    """
+    return bool(user and user.pk in get_broker_manager_ids())
+
+
+def invalidate_broker_manager_ids(role):
+    """
+    Removes the cached set of broker managers if *role* might have
+    changed it.
+    """
+    #pylint:disable=protected-access
+    db_alias = get_db_alias(role._state.db)
+    cache_key = _get_broker_managers_key(db_alias, role.organization_id)
+    transaction.on_commit(
+        lambda: caches['shared'].delete(cache_key), using=db_alias)
+
+
 def get_current_assets_dirs():
     """
     Returns path to the root of static assets for an App.
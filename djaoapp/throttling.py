@@ -0,0 +1,142 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Token-bucket throttling of expensive endpoints (contact, login,
+registration).
+
+Each client (identified by its IP address) gets one bucket per scope
+and per site. A bucket holds up to *N* tokens and is refilled at a rate
+of *N* tokens per period, as specified by `THROTTLE_RATES`
+(ex: `'5/min'`). Each request consumes one token; requests arriving
+while the bucket is empty are rejected.
+
+Buckets are stored in the `shared` cache. Unless that cache is shared
+between processes (see `CACHE_SHARED_BETWEEN_PROCESSES`), each worker
+keeps its own buckets. If that cache is unavailable, buckets are kept
+in a per-process local-memory cache instead such that throttling degrades
+rather than fails. Since a bucket is read then written back, concurrent
+requests can occasionally consume the same token.
+"""
+from __future__ import unicode_literals
+
+import logging, threading, time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.throttling import BaseThrottle
+
+from .cache import get_site_cache_key
+
+LOGGER = logging.getLogger(__name__)
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_local_cache = LocMemCache('djaoapp-throttling', {
+    'OPTIONS': {'MAX_ENTRIES': 10000}})
+
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {'allowed': 0, 'throttled': 0, 'fallbacks': 0})
+
+
+def parse_rate(rate):
+    """
+    Returns a tuple (capacity, period in seconds) from a *rate* string
+    formatted as `'<number of requests>/<s|sec|m|min|h|hour|d|day>'`.
+    """
+    num, period = rate.split('/')
+    return int(num), _PERIODS[period[0]]
+
+
+def get_throttle_stats():
+    """
+    Returns, per scope, the number of requests allowed, the number
+    of requests throttled, and the number of times the local-memory cache
+    was used because the shared cache was unavailable (fallbacks).
+    """
+    with _stats_lock:
+        return {scope: stats.copy() for scope, stats in _stats.items()}
+
+
+def _increment_stats(scope, key):
+    with _stats_lock:
+        _stats[scope][key] += 1
+
+
+def consume(scope, ident, now=None):
+    """
+    Consumes a token in the bucket for *ident* in *scope* and returns
+    `0` if the request is allowed. When the bucket is empty, returns
+    instead the number of seconds until a token is available.
+    """
+    rate = settings.THROTTLE_RATES.get(scope)
+    if not rate:
+        return 0
+    capacity, period = parse_rate(rate)
+    if now is None:
+        now = time.time()
+    key = get_site_cache_key('throttle:%s:%s' % (scope, ident))
+
+    cache = caches['shared']
+    try:
+        bucket = cache.get(key)
+    except Exception as err: #pylint:disable=broad-except
+        LOGGER.warning("throttling with local buckets: %r", err,
+            extra={'event': 'throttle-fallback', 'scope': scope})
+        _increment_stats(scope, 'fallbacks')
+        cache = _local_cache
+        bucket = cache.get(key)
+
+    tokens, last = bucket if bucket else (capacity, now)
+    tokens = min(capacity,
+        tokens + (now - last) * capacity / float(period))
+    wait = 0
+    if tokens >= 1:
+        tokens -= 1
+    else:
+        wait = (1 - tokens) * period / float(capacity)
+    try:
+        # A bucket left untouched for a period is full again.
+        cache.set(key, (tokens, now), timeout=period)
+    except Exception as err: #pylint:disable=broad-except
+        LOGGER.warning("throttling with local buckets: %r", err,
+            extra={'event': 'throttle-fallback', 'scope': scope})
+        _increment_stats(scope, 'fallbacks')
+        _local_cache.set(key, (tokens, now), timeout=period)
+
+    if wait:
+        _increment_stats(scope, 'throttled')
+        LOGGER.info("throttled %s request from %s", scope, ident,
+            extra={'event': 'throttled', 'scope': scope})
+    else:
+        _increment_stats(scope, 'allowed')
+    return wait
+
+
+def get_ident(request):
+    # `multitier.middleware.SetRemoteAddrFromForwardedFor` already set
+    # `REMOTE_ADDR` from the `X-Forwarded-For` header.
+    return request.META.get('REMOTE_ADDR', "")
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttles unsafe requests to views with a `throttle_scope`
+    listed in `THROTTLE_RATES`.
+    """
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self):
+        self.wait_time = None
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope or request.method in self.safe_methods:
+            return True
+        self.wait_time = consume(scope, get_ident(request))
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
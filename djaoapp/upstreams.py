@@ -0,0 +1,174 @@
+# Copyright (c) 2026, DjaoDjin inc.
+# see LICENSE
+
+"""
+Persistent connections to the upstream applications requests are
+forwarded to (see `djaoapp.views.product.ProxyPageMixin`).
+
+`rules` forwards requests through `requests.request`, which opens
+a new connection (TCP and TLS handshakes) for every request. Here we keep
+a `requests.Session` per entry point instead, such that connections are
+re-used, with at most `PROXY_POOL_SIZE` idle connections per worker process.
+
+Before a connection is re-used, urllib3 checks the upstream did not close
+it. Since upstreams usually close keep-alive connections after a few
+seconds of inactivity, all connections to an entry point that was not used
+for `PROXY_POOL_IDLE_TIMEOUT` seconds are closed, as they are after
+an upstream fails to accept a connection.
+
+The `requests.Session` is shared by all users, so it must not keep
+the cookies set by the upstream; they are forwarded to the browser
+instead.
+"""
+from __future__ import unicode_literals
+
+import http.cookiejar, logging, threading, time
+
+import requests
+from django.conf import settings
+from rules import settings as rules_settings
+
+LOGGER = logging.getLogger(__name__)
+
+_upstreams_lock = threading.Lock()
+_upstreams = {}
+
+
+class Upstream(object):
+    """
+    Pool of keep-alive connections to an upstream *entry_point*.
+    """
+    def __init__(self, entry_point):
+        self.entry_point = entry_point
+        self.session = requests.Session()
+        self.session.cookies.set_policy(
+            http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        self.adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+            pool_maxsize=settings.PROXY_POOL_SIZE, max_retries=0)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0, 'errors': 0, 'evictions': 0,
+            'latency_total': 0.0, 'latency_max': 0.0,
+            'connections': 0, 'pool_requests': 0}
+
+    def _get_pools(self):
+        pools = self.adapter.poolmanager.pools
+        return [pools[key] for key in pools.keys() if key in pools]
+
+    def evict(self):
+        """
+        Closes all idle connections to the upstream.
+        """
+        with self._lock:
+            # Counts of the pools we are about to discard are kept
+            # in the totals.
+            for pool in self._get_pools():
+                self._stats['connections'] += pool.num_connections
+                self._stats['pool_requests'] += pool.num_requests
+            self._stats['evictions'] += 1
+            self.adapter.poolmanager.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = self._stats.copy()
+            for pool in self._get_pools():
+                stats['connections'] += pool.num_connections
+                stats['pool_requests'] += pool.num_requests
+        nb_requests = stats.pop('pool_requests')
+        latency_total = stats.pop('latency_total')
+        stats.update({
+            'connections_reused': max(0, nb_requests - stats['connections']),
+            'latency_avg': (
+                latency_total / stats['requests']) if stats['requests'] else 0.0
+        })
+        return stats
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request to the upstream through the pool of connections.
+
+        The latency recorded is the time until `requests` returns. With
+        `stream=True` (as `ProxyPageMixin` does), that is the time until
+        the response headers were received; reading the body is not
+        accounted for.
+        """
+        kwargs.setdefault('timeout',
+            (settings.PROXY_CONNECT_TIMEOUT, rules_settings.TIMEOUT))
+        start = time.monotonic()
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.ConnectionError:
+            # We cannot trust the other connections to the upstream either.
+            with self._lock:
+                self._stats['errors'] += 1
+            self.evict()
+            raise
+        except requests.RequestException:
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        finally:
+            latency = time.monotonic() - start
+            with self._lock:
+                self._stats['requests'] += 1
+                self._stats['latency_total'] += latency
+                self._stats['latency_max'] = max(
+                    self._stats['latency_max'], latency)
+            LOGGER.debug("%s %s (Fwd to %s) in %.3fs",
+                method, url, self.entry_point, latency,
+                extra={'event': 'http_forward_latency',
+                    'fwd_to': self.entry_point, 'latency': latency})
+
+
+class UpstreamContent(object):
+    """
+    Iterates over the body of an upstream *response* (sent with
+    `stream=True`) as received, without decoding it, in chunks of
+    *chunk_size* bytes.
+
+    Django closes the content of a `StreamingHttpResponse` once it is sent,
+    or the client disconnected, which releases the connection to the pool
+    when the body was read entirely, and discards it otherwise.
+    """
+    def __init__(self, response, chunk_size):
+        self.response = response
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        return self.response.raw.stream(self.chunk_size, decode_content=False)
+
+    def close(self):
+        self.response.close()
+
+
+def get_upstream(entry_point):
+    """
+    Returns the `Upstream` for *entry_point*, closing its connections
+    first when it was not used for `PROXY_POOL_IDLE_TIMEOUT` seconds.
+    """
+    now = time.monotonic()
+    with _upstreams_lock:
+        upstream = _upstreams.get(entry_point)
+        if upstream is None:
+            upstream = Upstream(entry_point)
+            _upstreams[entry_point] = upstream
+        elif now - upstream.last_used > settings.PROXY_POOL_IDLE_TIMEOUT:
+            upstream.evict()
+        upstream.last_used = now
+    return upstream
+
+
+def get_upstream_stats():
+    """
+    Returns, per entry point, the number of requests forwarded, errors,
+    connections opened, connections re-used, evictions, and the average
+    and maximum latency (in seconds) until the response headers
+    were received (see `Upstream.request`).
+    """
+    with _upstreams_lock:
+        upstreams = list(_upstreams.values())
+    return {upstream.entry_point: upstream.get_stats()
+        for upstream in upstreams}
@@ -6,13 +6,14 @@ from saas.settings import PROFILE_URL_KWARG, SLUG_RE
 from signup.settings import USERNAME_PAT, EMAIL_VERIFICATION_PAT
 
 from ..api.auth import (CredentialsAPIView, DjaoAppJWTActivate,
-    DjaoAppJWTRefresh, DjaoAppJWTRegister)
+    DjaoAppJWTLogin, DjaoAppJWTRefresh, DjaoAppJWTRegister)
 from ..api.contact import (ContactUsAPIView, PlacesSuggestionsAPIView,
     PlacesDetailAPIView)
 from ..api.custom_themes import DjaoAppThemePackageListAPIView
 from ..api.notifications import NotificationAPIView, NotificationDetailAPIView
-from ..api.organizations import (DjaoAppProfileDetailAPIView,
-    DjaoAppProfileListAPIView, DjaoAppProfilePictureAPIView)
+from ..api.organizations import (DjaoAppProfileBatchAPIView,
+    DjaoAppProfileDetailAPIView, DjaoAppProfileListAPIView,
+    DjaoAppProfilePictureAPIView)
 from ..api.roles import DjaoAppRoleByDescrListAPIView
 from ..api.todos import DjaoAppAPIVersion, TodosAPIView, GenerateErrorAPIView
 from ..api.users import (RecentActivityAPIView, DjaoAppUserDetailAPIView,
@@ -90,6 +91,9 @@ urlpatterns = [
     url_direct(r'^api/', include('saas.urls.api.tailbroker')),
     url_authenticated(
         '^api/', include('saas.urls.api.search')),
+    # Access to each profile is checked in the view.
+    url_authenticated(r'^api/profiles$',
+        DjaoAppProfileBatchAPIView.as_view(), name='api_profile_batch'),
 
     # Auth & credentials
     url_provider_only(r'api/', include('signup.urls.api.dashboard.activities')),
@@ -117,6 +121,7 @@ urlpatterns = [
     url_prefixed(r'^api/auth/(?P<verification_key>%s)$'
         % EMAIL_VERIFICATION_PAT,
         DjaoAppJWTActivate.as_view(), name='api_activate'),
+    url_prefixed(r'^api/auth$', DjaoAppJWTLogin.as_view(), name='api_login'),
     url_prefixed(r'^api/', include('signup.urls.api.auth')),
 
     # DjaoApp-specific
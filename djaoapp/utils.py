@@ -2,16 +2,19 @@
 # see LICENSE
 from __future__ import unicode_literals
 
-import datetime, logging
+import datetime, json, logging, re
 
 from django.conf import settings
 from django.core.mail import get_connection as get_connection_base
 from rules.models import Rule
 from rules.utils import get_current_app
+from saas import settings as saas_settings
 from saas.decorators import _valid_manager
 from saas.models import get_broker
 
-from .compat import import_string, reverse
+from .cache import cache_delete, cache_get_or_set
+from .compat import import_string, is_authenticated, reverse
+from .perms import memoize_permission
 from .thread_locals import build_absolute_uri
 
 LOGGER = logging.getLogger(__name__)
@@ -126,6 +129,35 @@ def get_notified_on_errors(site=None):
 
     return settings.ADMINS
 
+# Permissions
+# -----------
+def valid_manager(request, candidates, user=None):
+    """
+    Returns the slugs of the organizations in *candidates* which have
+    *user* (defaults to `request.user`) as a manager.
+
+    Results are memoized for the duration of *request*, keyed by
+    (user, candidates, role level).
+    """
+    if user is None and request is not None and is_authenticated(request):
+        user = request.user
+    key = ('_valid_manager', user.pk if user else None,
+        tuple(sorted(str(candidate) for candidate in candidates)),
+        saas_settings.MANAGER)
+    return memoize_permission(request, key,
+        lambda: [_get_slug(result) for result in _valid_manager(
+            user, candidates)])
+
+
+def _get_slug(organization):
+    # `_valid_manager` returns `{'slug': ...}` rows, except when
+    # `BYPASS_PERMISSION_CHECK` is set, where it returns *candidates*
+    # as passed (i.e. `Organization` or slugs).
+    if isinstance(organization, dict):
+        return organization['slug']
+    return getattr(organization, 'slug', organization)
+
+
 # Authentication workflow
 # -----------------------
 def get_disabled_authentication(request, user):
@@ -133,7 +165,7 @@ def get_disabled_authentication(request, user):
     Used to override SIGNUP['DISABLED_AUTHENTICATION']
     """
     return (settings.AUTHENTICATION_OVERRIDE == AUTH_DISABLED
-        and not _valid_manager(user, [get_broker()]))
+        and not valid_manager(request, [get_broker()], user=user))
 
 
 def get_disabled_registration(request):#pylint:disable=unused-argument
@@ -157,17 +189,67 @@ def get_user_otp_required(request, user):
         role_description__otp_required=True).exists()
 
 
+def _get_plan_rules_key(app_id):
+    return 'plan_rules:%s' % app_id
+
+
+def _rule_kwargs_tokens(kwargs):
+    """
+    Returns the identifiers (ex: plan slugs) found in a `Rule.kwargs`.
+    """
+    try:
+        values = json.loads(kwargs).values()
+    except (AttributeError, ValueError):
+        return re.findall(r'[\w-]+', kwargs)
+    tokens = []
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            tokens += [str(item) for item in value if item is not None]
+        elif value is not None:
+            tokens += [str(value)]
+    return tokens
+
+
+def get_plan_rules_index(app):
+    """
+    Returns a dictionnary mapping a plan slug to the path of the highest
+    ranked rule of *app* that references the plan in its arguments.
+
+    The index is cached per app and rebuilt when one of its rules
+    is created, updated or deleted (see `djaoapp.signals`).
+    """
+    def _load_plan_rules_index():
+        index = {}
+        for rule in Rule.objects.filter(app=app).exclude(
+                kwargs="").order_by('-rank').values('path', 'kwargs'):
+            for token in _rule_kwargs_tokens(rule['kwargs']):
+                index.setdefault(token, rule['path'])
+        return index
+
+    #pylint:disable=protected-access
+    return cache_get_or_set(_get_plan_rules_key(app.pk),
+        _load_plan_rules_index, using=app._state.db)
+
+
+def invalidate_plan_rules_index(rule):
+    """
+    Removes the cached plan-to-rule index for the app *rule* belongs to,
+    once the current transaction (if any) commits.
+    """
+    #pylint:disable=protected-access
+    cache_delete(_get_plan_rules_key(rule.app_id), using=rule._state.db)
+
+
 def product_url(subscriber=None, plan=None, request=None):
     """
     Used to override SAAS['PRODUCT_URL_CALLABLE']
     """
     location = None
     if plan:
-        candidate_rule = Rule.objects.filter(
-            app=get_current_app(request),
-            kwargs__contains=str(plan)).order_by('-rank').first()
-        if candidate_rule:
-            location = candidate_rule.path.replace(
+        candidate_path = get_plan_rules_index(
+            get_current_app(request)).get(str(plan))
+        if candidate_path:
+            location = candidate_path.replace(
                 '{profile}', str(subscriber)).replace(
                 '{plan}',  str(plan))
     if not location:
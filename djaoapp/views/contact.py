@@ -1,4 +1,4 @@
-# Copyright (c) 2025, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 from __future__ import unicode_literals
 
@@ -21,6 +21,7 @@ from signup.auth import validate_redirect
 
 from ..compat import gettext_lazy as _, reverse, six
 from ..forms.widgets import CSPReCaptchaV2Checkbox
+from ..mixins import ThrottleMixin
 from ..signals import user_contact
 from ..utils import get_contact_captcha_keys
 from ..validators import validate_contact_form
@@ -92,10 +93,11 @@ class ContactForm(forms.Form):
             raise ValidationError(str(err))
 
 
-class ContactView(ProviderMixin, FormView):
+class ContactView(ThrottleMixin, ProviderMixin, FormView):
 
     form_class = ContactForm
     template_name = 'contact.html'
+    throttle_scope = 'contact'
 
     def dispatch(self, request, *args, **kwargs):
         try:
@@ -1,12 +1,10 @@
-# Copyright (c) 2025, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 from __future__ import unicode_literals
 
 import logging
 
 from django.conf import settings
-from saas import settings as saas_settings
-from saas.models import get_broker
 from saas.backends.stripe_processor.views import (
     StripeProcessorRedirectView as BaseStripeProcessorRedirectView)
 from saas.views.billing import (
@@ -22,7 +20,7 @@ from ..compat import reverse
 from ..forms.profile import PersonalProfileForm
 from ..notifications.signals import get_charge_updated_context
 from ..notifications.serializers import ChargeNotificationSerializer
-from ..thread_locals import dynamic_processor_keys
+from ..thread_locals import dynamic_processor_keys, is_broker_manager
 
 
 LOGGER = logging.getLogger(__name__)
@@ -73,10 +71,7 @@ class OrganizationProfileView(OrganizationProfileViewBase):
                 'email_verified_at': self.contact.email_verified_at,
                 'phone_verified_at': self.contact.phone_verified_at
             })
-        broker = get_broker()
-        user = self.request.user
-        if user and broker.with_role(saas_settings.MANAGER).filter(
-                pk=user.pk).exists():
+        if is_broker_manager(self.request.user):
             # If we have a request user who is a profile manager for the broker,
             # we will display the activity notes for the profile.
             update_context_urls(context, {
@@ -16,7 +16,7 @@ from signup.views.auth import (
 
 from ..forms.custom_signup import (ActivationForm, CodeActivationForm,
     PasswordResetConfirmForm, SigninForm, SignupForm)
-from ..mixins import AuthMixin as AuthBaseMixin
+from ..mixins import AuthMixin as AuthBaseMixin, ThrottleMixin
 from ..utils import PERSONAL_REGISTRATION
 
 
@@ -88,9 +88,10 @@ class VerifyCompleteView(AuthMixin, AppMixin, VerifyCompleteBaseView):
     form_class = ActivationForm
 
 
-class SigninView(AuthMixin, AppMixin, SigninBaseView):
+class SigninView(ThrottleMixin, AuthMixin, AppMixin, SigninBaseView):
 
     set_password_form_class = CodeActivationForm
+    throttle_scope = 'login'
 
 
 class SignoutView(SignoutBaseView):
@@ -98,7 +99,8 @@ class SignoutView(SignoutBaseView):
     pass
 
 
-class SignupView(AuthMixin, AppMixin, SignupBaseView):
+class SignupView(ThrottleMixin, AuthMixin, AppMixin, SignupBaseView):
 
     form_class = SignupForm
     set_password_form_class = CodeActivationForm
+    throttle_scope = 'register'
@@ -1,4 +1,4 @@
-# Copyright (c) 2025, DjaoDjin inc.
+# Copyright (c) 2026, DjaoDjin inc.
 # see LICENSE
 
 """
@@ -8,10 +8,11 @@ from __future__ import unicode_literals
 
 import io, logging, os
 
+import requests
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.staticfiles.views import serve as debug_serve
-from django.http import Http404, HttpResponse
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.template import TemplateDoesNotExist
 from django.template.loader import get_template
 from django.template.response import TemplateResponse
@@ -21,18 +22,20 @@ from django.views.static import serve as static_serve
 from extended_templates import settings as themes_settings
 from extended_templates.models import get_show_edit_tools, get_active_theme
 from extended_templates.views.pages import PageMixin
-from rules.utils import get_current_app
+from rules.utils import get_current_app, get_current_entry_point
 from rules.views.app import (AppMixin, SessionProxyMixin,
     AppDashboardView as AppDashboardViewBase)
-from saas.decorators import fail_direct
 from saas.mixins import OrganizationMixin, UserMixin
-from saas.models import ChargeItem, Plan, get_broker, is_broker
+from saas.models import Plan, get_broker, is_broker
 from saas.utils import get_organization_model
 from saas.views.plans import CartPlanListView
 from saas.views.redirects import OrganizationRedirectView
 
 from ..compat import gettext_lazy as _
+from ..decorators import fail_direct
+from ..invoice_keys import defer_clear_invoice_keys
 from ..mixins import DjaoAppMixin
+from ..upstreams import UpstreamContent, get_upstream
 
 LOGGER = logging.getLogger(__name__)
 
@@ -71,6 +74,37 @@ class ProxyPageMixin(DjaoAppMixin, PageMixin, SessionProxyMixin, AppMixin):
             content_type='text/html',
             status=503)
 
+    def fetch_remote_page(self):
+        """
+        Same as `SessionProxyMixin.fetch_remote_page` except the request
+        is sent through a pool of keep-alive connections to the upstream
+        (see `djaoapp.upstreams`), and the body of the response is only
+        read as needed (see `translate_response`).
+        """
+        entry_point = get_current_entry_point(request=self.request)
+        forward_url = '%s%s' % (entry_point, self.request.path)
+        requests_args = self.translate_request_args(self.request)
+        requests_args['stream'] = True
+        if LOGGER.getEffectiveLevel() == logging.DEBUG:
+            LOGGER.debug("\"%s %s (Fwd to %s)\" with session %s,"\
+                " updated headers: %s",
+                self.request.method, self.request.path, entry_point,
+                self.session, requests_args)
+        else:
+            LOGGER.info("\"%s %s (Fwd to %s)\"", self.request.method,
+                self.request.path, entry_point, extra={
+                    'event': 'http_forward', 'fwd_to': entry_point,
+                    'request': self.request})
+        response = get_upstream(entry_point).request(
+            self.request.method, forward_url, **requests_args)
+        try:
+            return self.translate_response(response)
+        except Exception:
+            # With `stream=True`, the connection is only released to the pool
+            # once the body was read or the response is closed.
+            response.close()
+            raise
+
     def get_template_names(self):
         candidates = super(ProxyPageMixin, self).get_template_names()
         page_name = self.kwargs.get('page', self.page_name)
@@ -88,18 +122,62 @@ class ProxyPageMixin(DjaoAppMixin, PageMixin, SessionProxyMixin, AppMixin):
         LOGGER.info('candidate page templates: %s', ','.join(candidates))
         return candidates
 
+    @staticmethod
+    def is_buffered(response):
+        """
+        Returns `True` when the body of the upstream *response* must be read
+        entirely before it is returned, i.e. when it is HTML the edition
+        tools might be injected into, or empty.
+        """
+        content_type = response.headers.get('content-type', '').lower()
+        if not content_type:
+            return True
+        for buffered in settings.PROXY_BUFFERED_CONTENT_TYPES:
+            if content_type.startswith(buffered):
+                return True
+        return False
+
+    def translate_streaming_response(self, response):
+        """
+        Same as `SessionProxyMixin.translate_response` except the body
+        is copied to the client as it is received from the upstream.
+        """
+        # We let `SessionProxyMixin.translate_response` translate the headers
+        # and cookies of the response, without reading its body.
+        headers_only = requests.Response()
+        headers_only.status_code = response.status_code
+        headers_only.headers = response.headers
+        headers_only.raw = response.raw
+        headers_only._content = b'' #pylint:disable=protected-access
+        translated = super(ProxyPageMixin, self).translate_response(
+            headers_only)
+        proxy_response = StreamingHttpResponse(
+            UpstreamContent(response, settings.PROXY_STREAM_CHUNK_SIZE),
+            status=response.status_code)
+        for key, value in translated.items():
+            proxy_response[key] = value
+        proxy_response.cookies = translated.cookies
+        # The body is passed through encoded as it was received,
+        # which is also what `Content-Length` refers to.
+        if 'content-encoding' in response.headers:
+            proxy_response['Content-Encoding'] = \
+                response.headers['content-encoding']
+        return proxy_response
 
     def translate_response(self, response):
         if response.status_code == 200:
             # We passed the invoice_keys into the session. When the remote
             # service returns HTTP 200 OK, we assume it synchronizes whichever
             # state necessary. We clear invoice_key/sync_on here so we won't
-            # generate another notification.
+            # generate another notification. The `ChargeItem` are updated
+            # after the response was sent (see `djaoapp.invoice_keys`).
             invoice_keys = self.session.get('invoice_keys', None)
             if invoice_keys:
-                ChargeItem.objects.filter(invoice_key__in=invoice_keys).update(
-                    invoice_key=None, sync_on="")
-        resp = super(ProxyPageMixin, self).translate_response(response)
+                defer_clear_invoice_keys(invoice_keys)
+        if self.is_buffered(response):
+            resp = super(ProxyPageMixin, self).translate_response(response)
+        else:
+            resp = self.translate_streaming_response(response)
         # 500 errors in the service the request was forwarded to will have
         # logged errors there.
         resp._has_been_logged = True #pylint:disable=protected-access